@@ -43,7 +43,9 @@ void main() {
     // Sample both textures
     vec4 texColor1 = texture(textureSampler1, TexCoord);
     vec2 tex = rotate(TexCoord, radians(rot));
-    vec4 texColor2 = texture(textureSampler2, tex);
+    // Bias of -0.5: rotation alone can raise the estimated LOD by up to log2(sqrt(2)),
+    // which must not pull mip levels into an unscaled preview
+    vec4 texColor2 = texture(textureSampler2, tex, -0.5);
 
     vec3 hsv = RGBtoHSV(texColor2.rgb);
     // hue is between -180 and 180
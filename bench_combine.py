@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+import cv2
+import numpy as np
+
+from modules.texture_operations import TextureOperations
+
+MAP_SUFFIXES = ["_diff_4k.png", "_arm_4k.png", "_nor_dx_4k.png", "_disp_4k.png"]
+
+
+def create_synthetic_maps(work_dir, slug, size, label):
+    """Write 16-bit maps shaped like a Polyhaven 4k asset into work_dir/staging, plus a 512px result texture."""
+    staging_dir = os.path.join(work_dir, "staging")
+    os.makedirs(os.path.join(staging_dir, "overlay"), exist_ok=True)
+    rng = np.random.default_rng(0)
+    for suffix in MAP_SUFFIXES:
+        channels = 1 if suffix == "_disp_4k.png" else 3
+        shape = (size, size) if channels == 1 else (size, size, channels)
+        cv2.imwrite(os.path.join(staging_dir, f"{slug}{suffix}"), rng.integers(0, 65535, shape, dtype=np.uint16))
+    open(os.path.join(work_dir, "terrain_dump.txt"), "w").close()
+
+    # combine_textures reads the overlay size from the texture's _result.png (a Windows-style relative path)
+    os.makedirs(os.path.join(work_dir, "textures"), exist_ok=True)
+    cv2.imwrite(os.path.join(work_dir, f"textures\\{label}_result.png"), np.zeros((512, 512, 3), dtype=np.uint8))
+
+
+def legacy_combine(texture_operations, slug, label):
+    """The previous serial pipeline: per-channel conversion, cv2.merge and one imwrite after another."""
+    staging_dir = "staging"
+    paths = {suffix: os.path.join(staging_dir, f"{slug}{suffix}") for suffix in MAP_SUFFIXES}
+    diff, arm, nor, disp = (cv2.imread(paths[suffix], cv2.IMREAD_UNCHANGED) for suffix in MAP_SUFFIXES)
+    convert = texture_operations.convert_to_8bit_single_channel
+
+    param_g = convert(arm[:, :, 1])
+    cv2.imwrite(os.path.join(staging_dir, f"{label}_param.png"),
+                cv2.merge([np.full_like(param_g, 128), param_g, convert(arm[:, :, 0]), convert(arm[:, :, 2])]))
+    cv2.imwrite(os.path.join(staging_dir, f"{label}_nh.png"),
+                cv2.merge([convert(nor[:, :, 0]), convert(nor[:, :, 1]), convert(nor[:, :, 2]), convert(disp)]))
+    cv2.imwrite(os.path.join(staging_dir, f"{label}.png"),
+                cv2.merge([convert(diff[:, :, 0]), convert(diff[:, :, 1]), convert(diff[:, :, 2])]))
+
+
+def time_call(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), sum(timings) / len(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark combine_textures on a set of Polyhaven maps.")
+    parser.add_argument("--work-dir", help="Folder containing staging/ with downloaded maps (default: synthetic 4k maps)")
+    parser.add_argument("--slug", default="bench_rock", help="Asset slug the map files start with")
+    parser.add_argument("--size", type=int, default=4096, help="Synthetic map size")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    label = f"bench_{args.slug}"
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="pbrmatcher_bench_")
+    if not args.work_dir:
+        print(f"Generating synthetic {args.size}x{args.size} 16-bit maps in {work_dir}")
+        create_synthetic_maps(work_dir, args.slug, args.size, label)
+    os.chdir(work_dir)
+
+    texture_operations = TextureOperations(None, None)
+
+    best, mean = time_call(lambda: legacy_combine(texture_operations, args.slug, f"textures_legacy_{label}"), args.repeat)
+    print(f"legacy serial pipeline:   best {best:.3f}s  mean {mean:.3f}s")
+
+    best, mean = time_call(lambda: texture_operations.combine_textures("", args.slug, label), args.repeat)
+    print(f"combine_textures:         best {best:.3f}s  mean {mean:.3f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
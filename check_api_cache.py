@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+import argparse
+import requests
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import modules.api_operations as api_ops
+
+from modules.api_cache import ApiCacheStore
+
+
+class StandInApi(BaseHTTPRequestHandler):
+    """Serves one JSON document with an ETag, answers If-None-Match with 304 and has a slow endpoint."""
+
+    document = {"rock_01": {"name": "Rock 01"}}
+    etag = '"v1"'
+    delay = 0.0
+    log = []
+
+    def do_GET(self):
+        type(self).log.append((self.path, self.headers.get("If-None-Match")))
+        if self.path.startswith("/slow"):
+            time.sleep(type(self).delay)
+        if self.headers.get("If-None-Match") == type(self).etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(type(self).document).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", type(self).etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def wait_for_refresh(url):
+    """Fetch a stale url and wait for the background revalidation; returns (immediate data, refreshed data)."""
+    refreshed = []
+    done = threading.Event()
+    data = api_ops.fetch_api_data(url, on_refresh=lambda result: (refreshed.append(result), done.set()))
+    done.wait(5)
+    # The refresh thread clears its in-flight marker after the callback
+    deadline = time.time() + 5
+    while url in api_ops._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+    return data, refreshed[0] if refreshed else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check fetch_api_data's caching, revalidation, timeout and offline mode against a local stand-in server.")
+    parser.add_argument("--timeout", type=float, default=0.5, help="API timeout used for the slow-endpoint check")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    url = f"{base_url}/assets?type=textures"
+
+    work_dir = tempfile.mkdtemp()
+    api_ops.api_cache = ApiCacheStore(db_path=os.path.join(work_dir, "api_cache.sqlite3"))
+    api_ops.API_TIMEOUT = args.timeout
+
+    results = []
+
+    def check(name, passed):
+        results.append(passed)
+        print(f"{name}: {'ok' if passed else 'FAIL'}")
+
+    try:
+        data = api_ops.fetch_api_data(url)
+        entry = api_ops.api_cache.get(url)
+        check("first fetch stores the response and its ETag",
+              data == StandInApi.document and entry is not None and entry["etag"] == '"v1"')
+
+        StandInApi.log.clear()
+        check("fresh entry is served without a request", api_ops.fetch_api_data(url) == data and not StandInApi.log)
+
+        api_ops.api_cache.ttl = 0
+        StandInApi.log.clear()
+        cached, refreshed = wait_for_refresh(url)
+        check("stale entry is served at once and revalidated with If-None-Match",
+              cached == data and refreshed == data and StandInApi.log == [("/assets?type=textures", '"v1"')])
+
+        StandInApi.document = {"rock_01": {"name": "Rock 01"}, "moss_02": {"name": "Moss 02"}}
+        StandInApi.etag = '"v2"'
+        cached, refreshed = wait_for_refresh(url)
+        entry = api_ops.api_cache.get(url)
+        check("changed document is delivered by the background refresh and stored",
+              cached == data and refreshed == StandInApi.document and entry["etag"] == '"v2"')
+
+        StandInApi.delay = args.timeout * 4
+        started = time.time()
+        try:
+            api_ops.request_api_data(f"{base_url}/slow")
+            timed_out = False
+        except requests.Timeout:
+            timed_out = True
+        check("slow server hits the request timeout", timed_out and time.time() - started < args.timeout * 3)
+
+        api_ops.set_offline_mode(True)
+        StandInApi.log.clear()
+        offline_cached = api_ops.fetch_api_data(url)
+        offline_missing = api_ops.fetch_api_data(f"{base_url}/assets?type=hdris")
+        check("offline mode serves only from the cache",
+              offline_cached == StandInApi.document and offline_missing is None and not StandInApi.log)
+    finally:
+        api_ops.set_offline_mode(False)
+        api_ops.api_cache.close()
+        server.shutdown()
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
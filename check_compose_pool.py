@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+
+import modules.download_manager as download_manager
+
+from modules.download_manager import DownloadManager
+
+
+def scripted_compose(texture_path, texture_id, texture_name_label, staged_files=None):
+    """Stand-in for compose_texture: logs start/end to texture_path, sleeps, or kills its worker process."""
+    with open(texture_path, "a") as log:
+        log.write(f"{texture_name_label} start {time.time()}\n")
+    if staged_files.get("crash"):
+        os._exit(1)
+    time.sleep(staged_files.get("sleep", 0.1))
+    with open(texture_path, "a") as log:
+        log.write(f"{texture_name_label} end {time.time()}\n")
+
+
+class EventLoop:
+    """Minimal root for DownloadManager: after() callbacks are dropped, this check only drives the compose stage."""
+
+    def after(self, delay, callback=None):
+        pass
+
+
+def run_jobs(manager, log_path, jobs, timeout=30):
+    """Queue (asset, label, staged_files) jobs and wait for every item to finish; returns (events, errors, all finished)."""
+    finished = []
+    errors = []
+    done = threading.Event()
+
+    def finish_item(item):
+        finished.append(item)
+        if len(finished) == len(jobs):
+            done.set()
+
+    manager.finish_item = finish_item
+    manager.show_error = lambda title, message: errors.append(message)
+    manager.start_compose_stage()
+    for texture_id, label, staged_files in jobs:
+        manager.compose_queue.put(((label,), log_path, texture_id, label, staged_files))
+    done.wait(timeout)
+
+    events = {}
+    with open(log_path) as log:
+        for line in log:
+            label, event, stamp = line.split()
+            events[(label, event)] = float(stamp)
+    return events, errors, len(finished) == len(jobs)
+
+
+def main():
+    work_dir = tempfile.mkdtemp()
+    os.chdir(work_dir)
+    download_manager.compose_texture = scripted_compose
+    manager = DownloadManager({"textures": {}}, EventLoop(), None, None, {})
+
+    results = []
+
+    def check(name, passed):
+        results.append(passed)
+        print(f"{name}: {'ok' if passed else 'FAIL'}")
+
+    # A worker dies while another asset is composing and more are queued behind it
+    events, errors, all_finished = run_jobs(manager, os.path.join(work_dir, "crash.log"), [
+        ("boom", "boom", {"crash": True}),
+        ("rock", "rock", {"sleep": 0.5}),
+        ("moss", "moss", {}),
+        ("sand", "sand", {}),
+    ])
+    check("every queued item finishes after a worker crash", all_finished)
+    check("only the crashing asset fails", len(errors) == 1 and "boom" not in [label for label, event in events if event == "end"])
+    check("assets queued or running during the crash still compose",
+          all((label, "end") in events for label in ("rock", "moss", "sand")))
+
+    # A second compose of an asset waits for the first without holding up other assets
+    events, errors, all_finished = run_jobs(manager, os.path.join(work_dir, "parked.log"), [
+        ("rock", "rock_a", {"sleep": 1.0}),
+        ("rock", "rock_b", {}),
+        ("moss", "moss", {}),
+    ])
+    check("parked items finish", all_finished and not errors)
+    check("same-asset composes run one after another", events[("rock_b", "start")] >= events[("rock_a", "end")])
+    check("other assets dispatch while one is parked", events[("moss", "end")] < events[("rock_a", "end")])
+
+    manager.compose_executor.shutdown(wait=True)
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
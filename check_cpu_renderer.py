@@ -0,0 +1,22 @@
+import sys
+import argparse
+
+from modules.cpu_renderer import CpuRenderer
+
+from compare_renderers import CPU_CASES, GOLDEN_DIR, TOLERANCE, render_all, load_goldens, compare
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the CPU preview renderer against the committed OpenGL goldens; needs no OpenGL context or moderngl.")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR, help="Folder of golden PNGs written by compare_renderers.py --update")
+    parser.add_argument("--tolerance", type=int, default=TOLERANCE, help="Allowed per-channel difference (see compare_renderers.TOLERANCE)")
+    args = parser.parse_args()
+
+    goldens = load_goldens(args.golden_dir)
+    height, width = goldens[(CPU_CASES[0], 0)][1].shape[:2]
+    frames = render_all(CpuRenderer(width, height), width, height, CPU_CASES)
+    return 0 if compare("cpu/golden", frames, goldens, args.tolerance) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import os
+import sys
+import argparse
+import numpy as np
+from PIL import Image
+
+from modules.render_state import RenderState
+from modules.cpu_renderer import CpuRenderer
+
+# Render states covering the blend split, rotation, hue wrap-around, saturation/value scaling and the HSV stripes.
+# The stripes are unrotated: hue and saturation amplify filtering differences, and unrotated lookups hit texel centers
+STATES = [
+    RenderState(0.0, 0.0, 0.0, 1.0, 1.0, 0.0),
+    RenderState(0.5, 0.0, 0.0, 1.0, 1.0, 0.0),
+    RenderState(1.0, 37.0, 0.0, 1.0, 1.0, 0.0),
+    RenderState(0.5, -90.0, 170.0, 1.0, 1.0, 0.0),
+    RenderState(0.5, 180.0, -170.0, 0.4, 1.3, 0.0),
+    RenderState(0.7, 0.0, 45.0, 1.8, 0.6, 1.0),
+]
+
+# Input texture size as a multiple of the output: same size, and minified like a 2048 texture in the preview
+CASES = {"state": 1, "minified": 4}
+
+# CpuRenderer samples the base level only; minified states are checked on the mipmapped OpenGL path alone
+CPU_CASES = ("state",)
+
+# OpenGL renders of every case, written with --update on Mesa's llvmpipe
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "renderer")
+
+# GL leaves texture filtering precision to the implementation: llvmpipe filters 8-bit textures
+# in fixed point, which lands within 2 of float bilinear sampling on the rotated states
+TOLERANCE = 2
+
+
+def create_inputs(width, height):
+    """Base and overlay textures with gradients, saturated colors and gray areas."""
+    x = np.linspace(0, 1, width, dtype=np.float32)
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    base = np.stack([np.broadcast_to(x, (height, width)), np.broadcast_to(y, (height, width)), np.full((height, width), 0.3)], axis=-1)
+    overlay = np.stack([np.sin(x * 9) * 0.5 + 0.5 + y * 0, np.cos(y * 7) * 0.5 + 0.5 + x * 0, (x + y) / 2], axis=-1)
+    to_image = lambda array: Image.fromarray((np.clip(array, 0, 1) * 255).astype(np.uint8))
+    return to_image(base), to_image(overlay)
+
+
+def render_all(renderer, width, height, cases=tuple(CASES)):
+    """Render every state for the given cases; returns {(case, index): (state, frame)}."""
+    frames = {}
+    for case in cases:
+        scale = CASES[case]
+        base, overlay = create_inputs(width * scale, height * scale)
+        renderer.update_texture(base, 0)
+        renderer.update_texture(overlay, 1)
+        for index, state in enumerate(STATES):
+            frames[(case, index)] = (state, np.asarray(renderer.render(state)[0], dtype=np.int16))
+    return frames
+
+
+def load_goldens(golden_dir):
+    """Golden frames for every case and state, keyed like render_all."""
+    return {
+        (case, index): (state, np.asarray(Image.open(os.path.join(golden_dir, f"{case}_{index}.png")).convert("RGB"), dtype=np.int16))
+        for case in CASES for index, state in enumerate(STATES)
+    }
+
+
+def compare(name, frames, references, tolerance):
+    """Print the difference of every frame that has a reference; returns True if all are within tolerance."""
+    passed = True
+    for key, (state, frame) in frames.items():
+        if key not in references:
+            continue
+        difference = np.abs(frame - references[key][1])
+        over = int(np.count_nonzero(difference.max(axis=-1) > tolerance))
+        passed &= over == 0
+        print(f"{name} {key[0]} {key[1]} {state}: max diff {difference.max()}, {over} pixels over tolerance - {'ok' if over == 0 else 'FAIL'}")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the CPU preview renderer against OpenGL and/or golden images.")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR, help="Folder of golden PNGs: compared against, or written with --update")
+    parser.add_argument("--update", action="store_true", help="Write the OpenGL renders to --golden-dir")
+    parser.add_argument("--tolerance", type=int, default=TOLERANCE, help="Allowed per-channel difference (GPU texture filtering precision)")
+    parser.add_argument("--size", type=int, nargs=2, default=(320, 240), metavar=("WIDTH", "HEIGHT"))
+    args = parser.parse_args()
+
+    width, height = args.size
+    cpu_frames = render_all(CpuRenderer(width, height), width, height, CPU_CASES)
+
+    gl_frames = None
+    try:
+        from modules.glClass import OffscreenRenderer
+        gl_frames = render_all(OffscreenRenderer(width, height), width, height)
+    except Exception as e:
+        print(f"OpenGL renderer unavailable ({e}); skipping the OpenGL comparisons")
+
+    goldens = None
+    if args.golden_dir:
+        if args.update:
+            if gl_frames is None:
+                print("Golden images must be rendered with OpenGL")
+                return 1
+            os.makedirs(args.golden_dir, exist_ok=True)
+            for (case, index), (state, frame) in gl_frames.items():
+                Image.fromarray(frame.astype(np.uint8)).save(os.path.join(args.golden_dir, f"{case}_{index}.png"))
+            print(f"Wrote {len(gl_frames)} golden images to {args.golden_dir}")
+        else:
+            goldens = load_goldens(args.golden_dir)
+
+    comparisons = []
+    if gl_frames is not None:
+        comparisons.append(("cpu/opengl", cpu_frames, gl_frames))
+    if goldens is not None:
+        comparisons.append(("cpu/golden", cpu_frames, goldens))
+        if gl_frames is not None:
+            comparisons.append(("opengl/golden", gl_frames, goldens))
+    if not comparisons:
+        print("Nothing to compare against: no OpenGL context and no --golden-dir")
+        return 1
+
+    passed = True
+    for name, frames, references in comparisons:
+        passed &= compare(name, frames, references, args.tolerance)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import os
 import re
 
+from modules.terrain_list import TerrainList
+
 def find_missing_alternatives(folder_path, text_file_path):
     """
     Finds texture names in a text file that have a corresponding base texture
@@ -19,8 +21,7 @@ def find_missing_alternatives(folder_path, text_file_path):
 
 
     try:
-        with open(text_file_path, 'r') as f:
-            texture_names_from_text = [line.strip().lower() for line in f]  # Lowercase on read
+        texture_names_from_text = TerrainList.for_file(text_file_path).get_names()  # Lowercased, extensions removed
     except FileNotFoundError:
         print(f"Error: Text file '{text_file_path}' not found.")
         return None
@@ -29,7 +30,8 @@ def find_missing_alternatives(folder_path, text_file_path):
         return None
 
     try:
-        texture_files_in_folder = [f.lower() for f in os.listdir(folder_path)] # Lowercase folder files immediately
+        # Base names of the folder files, lowercased with extensions removed
+        texture_files_in_folder = {os.path.splitext(f.lower())[0] for f in os.listdir(folder_path)}
     except FileNotFoundError:
         print(f"Error: Folder '{folder_path}' not found.")
         return None
@@ -37,24 +39,12 @@ def find_missing_alternatives(folder_path, text_file_path):
         print(f"Error reading folder: {e}")
         return None
 
-    missing_alternatives = []
+    missing_alternatives = [
+        base_name
+        for base_name in texture_names_from_text
+        if base_name in texture_files_in_folder and base_name + "_diffparam" not in texture_files_in_folder
+    ]
 
-    for texture_name_from_text in texture_names_from_text:
-        base_name = os.path.splitext(texture_name_from_text)[0] # remove extension from txt name
-        base_found = False
-        for file_name in texture_files_in_folder:
-            if os.path.splitext(file_name)[0] == base_name: #compare without extension
-                base_found = True
-                diffparam_name = base_name + "_diffparam"
-                diffparam_found = False
-                for file_name2 in texture_files_in_folder: #second loop to find the diffparam
-                    if os.path.splitext(file_name2)[0] == diffparam_name:
-                        diffparam_found = True
-                        break
-                if not diffparam_found:
-                    missing_alternatives.append(base_name)
-                break # stop the loop after finding the base
-        
     return missing_alternatives
 
 if __name__ == "__main__":
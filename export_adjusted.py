@@ -0,0 +1,127 @@
+import os
+import sys
+import argparse
+import cv2
+import numpy as np
+
+from PIL import Image
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import modules.api_operations as api_ops
+
+from modules.constants import POLYHAVEN_API_URL, EXPORT_FOLDER, CONVERT_TILE_PIXELS
+from modules.cpu_renderer import adjust_overlay
+from modules.database_operations import load_database
+from modules.png_stream import PngStreamWriter
+from modules.staging_index import staging_index
+from modules.utility_functions import get_key_by_name
+
+
+def rgb_view(texture):
+    """Return an RGB view of a decoded cv2 image (no copy) and the scale that maps its values to 0..1."""
+    if texture.ndim == 2:
+        texture = np.broadcast_to(texture[:, :, None], texture.shape + (3,))
+    else:
+        texture = texture[:, :, 2::-1]  # BGR(A) -> RGB
+    if texture.dtype == np.uint8:
+        return texture, 1.0 / 255.0
+    if texture.dtype == np.uint16:
+        return texture, 1.0 / 65535.0
+    return texture, 1.0
+
+
+def export_adjusted(source_path, output_path, hsvr):
+    """
+    Apply a stored hsvr to a full-resolution diffuse map and write it as an 8-bit PNG.
+
+    The adjustment is the preview shader's overlay path (rotated, repeating UVs, hue
+    shift, saturation/value scale), evaluated in row strips. The source stays in its
+    decoded dtype and only each strip's samples are converted to float, so memory
+    is the decoded source plus one strip of intermediates.
+    """
+    texture = cv2.imread(source_path, cv2.IMREAD_UNCHANGED)
+    if texture is None:
+        raise IOError(f"Failed to load image: {source_path}")
+    texture, scale = rgb_view(texture)
+
+    height, width = texture.shape[:2]
+    strip_rows = max(1, CONVERT_TILE_PIXELS // (width * 3))
+    u = (np.arange(width, dtype=np.float32) + 0.5) / width
+    with PngStreamWriter(output_path, width, height, 3, bgr=False) as writer:
+        for start in range(0, height, strip_rows):
+            v = (np.arange(start, min(height, start + strip_rows), dtype=np.float32) + 0.5) / height
+            strip_u, strip_v = np.meshgrid(u, v)
+            color = adjust_overlay(texture, strip_u, strip_v,
+                                   hsvr.get("rotation", 0), hsvr.get("hue", 0),
+                                   hsvr.get("saturation", 1.0), hsvr.get("value", 1.0), scale)
+            writer.write_rows(np.floor(np.clip(color, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8))
+    return output_path
+
+
+def staged_pixels(path):
+    """Pixel count of a staged image read from its header, or 0 if it cannot be read."""
+    try:
+        with Image.open(path) as image:
+            return image.width * image.height
+    except OSError:
+        return 0
+
+
+def full_resolution_diffuse(asset_id):
+    """Return the largest staged diffuse of an asset (several resolutions or formats may be staged), or None."""
+    paths = staging_index.find_all(asset_id, "diff")
+    return max(paths, key=staged_pixels) if paths else None
+
+
+def collect_jobs(db, all_assets, output_dir):
+    """Yield (source_path, output_path, hsvr) for every selected thumbnail with stored HSVR values."""
+    for texture_path, texture_data in db["textures"].items():
+        label = os.path.basename(texture_path.replace("\\", "/"))
+        label = os.path.splitext(label)[0].replace("_result", "")
+        for thumbnail in texture_data.get("selected_thumbnails", []):
+            if not isinstance(thumbnail, dict) or "hsvr" not in thumbnail:
+                continue
+            asset_id = get_key_by_name(all_assets, thumbnail["name"])
+            source_path = full_resolution_diffuse(asset_id) if asset_id else None
+            if source_path is None:
+                print(f"No staged diffuse for {thumbnail['name']} ({texture_path}); download it first")
+                continue
+            yield source_path, os.path.join(output_dir, f"{label}_{asset_id}.png"), thumbnail["hsvr"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export staged diffuse maps with each selected thumbnail's saved HSVR applied.")
+    parser.add_argument("--output", default=EXPORT_FOLDER, help="Folder the adjusted textures are written to")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parallel export processes")
+    parser.add_argument("--skip-existing", action="store_true", help="Keep outputs that already exist")
+    parser.add_argument("--offline", action="store_true", help="Resolve asset names from the API cache only")
+    args = parser.parse_args()
+
+    api_ops.set_offline_mode(args.offline)
+    all_assets = api_ops.fetch_api_data(f"{POLYHAVEN_API_URL}/assets?type=textures")
+    if not all_assets:
+        print("Could not load the Polyhaven asset list")
+        return 1
+
+    os.makedirs(args.output, exist_ok=True)
+    jobs = [
+        job for job in collect_jobs(load_database(), all_assets, args.output)
+        if not (args.skip_existing and os.path.exists(job[1]))
+    ]
+    print(f"Exporting {len(jobs)} adjusted textures to {args.output}")
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(export_adjusted, *job): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                print(f"[{done}/{len(jobs)}] {future.result()}")
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{len(jobs)}] Failed {futures[future][0]}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
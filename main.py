@@ -1,13 +1,13 @@
 from tkinter import Tk
 from OpenGL import GL
 from pyopengltk import OpenGLFrame
-from modules.constants import SET_PROFILER
-from modules.utility_functions import set_profiler
+from modules.constants import SET_PROFILER, TRACE_FILE
+from modules.instrumentation import tracer
 from modules.database_operations import load_database
 from modules.gui_components import TextureTagger
 
 if SET_PROFILER:
-    set_profiler()
+    tracer.enable()
 
 # Main
 if __name__ == "__main__":
@@ -19,3 +19,9 @@ if __name__ == "__main__":
 
     # Make sure to clean up when the window is closed
     app.gl_frame.cleanup()
+    app.display_cache.shutdown()
+    app.thumbnail_service.shutdown()
+
+    if tracer.enabled:
+        tracer.export_chrome_trace(TRACE_FILE)
+        print(f"Wrote {TRACE_FILE}\n{tracer.summary()}")
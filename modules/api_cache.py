@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from modules.constants import API_CACHE_DB, API_CACHE_TTL, API_CACHE_MAX_BYTES
+
+LEGACY_CACHE_FILE = "api_cache.json"
+
+
+class ApiCacheStore:
+    """SQLite-backed API response cache with one record per URL.
+
+    The database is opened lazily on first use, so a lookup costs a single
+    indexed read instead of parsing the whole cache. Records carry the time
+    they were stored plus the ETag/Last-Modified validators of the response,
+    expire after `ttl` seconds and the oldest records are evicted once the
+    stored bodies exceed `max_bytes`.
+    """
+
+    def __init__(self, db_path=API_CACHE_DB, ttl=API_CACHE_TTL, max_bytes=API_CACHE_MAX_BYTES):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open the database and create the schema on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    url TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    stored_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at)")
+            self._conn.commit()
+            self._import_legacy_cache()
+        return self._conn
+
+    def _import_legacy_cache(self):
+        """Move entries from the old single-file api_cache.json into the store, once."""
+        if not os.path.exists(LEGACY_CACHE_FILE):
+            return
+        try:
+            with open(LEGACY_CACHE_FILE, "r") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not import legacy API cache: {e}")
+            return
+
+        now = time.time()
+        for url, data in legacy.items():
+            body = json.dumps(data)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO entries (url, body, etag, last_modified, stored_at, size) VALUES (?, ?, NULL, NULL, ?, ?)",
+                (url, body, now, len(body)),
+            )
+        self._conn.commit()
+        os.replace(LEGACY_CACHE_FILE, f"{LEGACY_CACHE_FILE}.imported")
+        print(f"Imported {len(legacy)} entries from {LEGACY_CACHE_FILE}")
+
+    def get(self, url):
+        """Return the cached entry for url, or None.
+
+        The entry is a dict with 'data', 'etag', 'last_modified' and 'stored_at'.
+        Expired entries are still returned; use is_fresh() to check them.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT body, etag, last_modified, stored_at FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, stored_at = row
+        return {"data": json.loads(body), "etag": etag, "last_modified": last_modified, "stored_at": stored_at}
+
+    def is_fresh(self, entry):
+        """Return True if the entry is younger than the TTL."""
+        return entry is not None and time.time() - entry["stored_at"] < self.ttl
+
+    def put(self, url, data, etag=None, last_modified=None):
+        """Store the response for url and evict the oldest entries if over budget."""
+        body = json.dumps(data)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (url, body, etag, last_modified, stored_at, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, time.time(), len(body)),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def touch(self, url):
+        """Mark an entry as freshly validated without rewriting its body."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE entries SET stored_at = ? WHERE url = ?", (time.time(), url))
+            conn.commit()
+
+    def _evict(self, conn):
+        """Delete the oldest entries until the stored bodies fit in max_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in conn.execute("SELECT url, size FROM entries ORDER BY stored_at").fetchall():
+            conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,35 +1,89 @@
-import os
-import json
+import threading
 import requests
 from tkinter import messagebox
 
-CACHE_FILE = "api_cache.json"
+from modules.api_cache import ApiCacheStore
+from modules.constants import API_TIMEOUT, OFFLINE_MODE
 
-def load_api_cache():
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "r") as f:
-            return json.load(f)
-    return {}
+api_cache = ApiCacheStore()
+offline_mode = OFFLINE_MODE
 
-def save_api_cache(cache):
-    with open(CACHE_FILE, "w") as f:
-        json.dump(cache, f, indent=4)
+# URLs with a background refresh currently running
+_refreshing = set()
+_refreshing_lock = threading.Lock()
 
-def fetch_api_data(url):
-    cache = load_api_cache()
-    if url in cache:
-        return cache[url]
-    
+def set_offline_mode(enabled):
+    """Serve API data only from the cache and never touch the network."""
+    global offline_mode
+    offline_mode = enabled
+
+def request_api_data(url, entry=None):
+    """
+    Fetch url, revalidating against the cached entry when there is one.
+
+    Returns the response data, or the cached data if the server answered
+    304 Not Modified. Raises requests.RequestException on network errors
+    and on any other status code.
+    """
     headers = {'User-Agent': 'pbrmatcher'}
+    if entry is not None:
+        if entry.get("etag"):
+            headers['If-None-Match'] = entry["etag"]
+        if entry.get("last_modified"):
+            headers['If-Modified-Since'] = entry["last_modified"]
+
+    response = requests.get(url, headers=headers, timeout=API_TIMEOUT)
+    if response.status_code == 304 and entry is not None:
+        api_cache.touch(url)
+        return entry["data"]
+    if response.status_code != 200:
+        raise requests.HTTPError(f"Failed to fetch data. Status code: {response.status_code}", response=response)
+
+    data = response.json()
+    api_cache.put(url, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return data
+
+def refresh_in_background(url, entry, on_refresh=None):
+    """Revalidate a stale cache entry on a worker thread; on_refresh(data) is called with the result."""
+    with _refreshing_lock:
+        if url in _refreshing:
+            return
+        _refreshing.add(url)
+
+    def worker():
+        try:
+            data = request_api_data(url, entry)
+            if on_refresh is not None:
+                on_refresh(data)
+        except requests.RequestException as e:
+            print(f"Background refresh of {url} failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(url)
+
+    threading.Thread(target=worker, daemon=True).start()
+
+def fetch_api_data(url, on_refresh=None):
+    """
+    Return the API data for url.
+
+    Fresh cache entries are returned directly. Stale entries are returned
+    immediately and revalidated in the background, so only a URL that was
+    never cached waits on the network. In offline mode only the cache is used.
+    """
+    entry = api_cache.get(url)
+    if entry is not None and (offline_mode or api_cache.is_fresh(entry)):
+        return entry["data"]
+    if offline_mode:
+        print(f"Offline mode: no cached data for {url}")
+        return None
+
+    if entry is not None:
+        refresh_in_background(url, entry, on_refresh)
+        return entry["data"]
+
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            cache[url] = response.json()
-            save_api_cache(cache)
-            return cache[url]
-        else:
-            messagebox.showerror("Network Error", f"Failed to fetch data. Status code: {response.status_code}")
+        return request_api_data(url)
     except requests.RequestException as e:
         messagebox.showerror("Network Error", f"An error occurred: {e}")
-    
-    return None
\ No newline at end of file
+    return None
@@ -2,5 +2,50 @@ DB_FILE = "db.json"
 TARGET_FOLDER = "staging/textures/"  # Replace with the actual folder path
 OVERLAY_FOLDER ="staging/overlay/"
 THUMBNAIL_CACHE_DIR = "thumbnails"
-SET_PROFILER = False
-FILE_CONFIG = False
\ No newline at end of file
+THUMBNAIL_DISPLAY_DIR = "thumbnails/display"  # Thumbnails stored at the sizes the GUI shows them
+THUMBNAIL_VARIANTS = {  # Display variant -> box the thumbnail is fitted into before scaling (None: no fit)
+    "grid": 512,
+    "preview": None,
+}
+THUMBNAIL_DISPLAY_SCALE = 1.5
+SET_PROFILER = False  # Record instrumentation spans and write TRACE_FILE on exit
+FILE_CONFIG = False
+API_CACHE_DB = "api_cache.sqlite3"
+API_CACHE_TTL = 24 * 60 * 60  # Seconds before a cached API response is refetched
+API_CACHE_MAX_BYTES = 256 * 1024 * 1024
+API_TIMEOUT = 10  # Seconds before an API request is abandoned
+OFFLINE_MODE = False  # Serve API data only from the local cache
+DOWNLOAD_WORKERS = 8  # Concurrent file transfers sharing the connection pool
+DOWNLOAD_ASSET_WORKERS = 4  # Queue items processed at the same time
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = 30
+POLYHAVEN_API_URL = "https://api.polyhaven.com"
+DOWNLOAD_QUEUE_FILE = "download_queue.json"
+MD5_CACHE_FILE = "md5_cache.json"
+COMPOSE_WORKERS = 2  # Processes combining downloaded maps into output textures
+COMPOSE_QUEUE_SIZE = 4  # Downloaded assets allowed to wait for a compose worker
+ENCODE_WORKERS = 4  # Threads decoding and encoding the maps of one composite
+TERRAIN_FILE = "terrain_dump.txt"  # Terrain textures that also get a _diffparam variant
+DOWNLOAD_RESOLUTION_SCALE = 4  # Source maps must be at least this multiple of the target texture size
+DOWNLOAD_MAX_RESOLUTION = 4096
+DOWNLOAD_FORMATS = {  # Allowed formats per map role; the smallest file at the chosen resolution wins
+    "diff": ["png", "jpg"],
+    "arm": ["png"],
+    "nor": ["png"],
+    "disp": ["png"],
+}
+CONVERT_TILE_PIXELS = 1024 * 1024  # Values converted per strip when reducing maps to 8-bit
+TILED_COMPOSE_PIXELS = 4096 * 4096  # Sources larger than this are composed in row strips, one decoded source at a time
+PNG_COMPRESSION_LEVEL = 1  # zlib level of streamed PNG outputs, as OpenCV's default
+DISPLAY_IMAGE_HEIGHT = 480
+DISPLAY_WORKERS = 2  # Threads decoding and resizing display images (cv2 releases the GIL)
+DISPLAY_CACHE_MAX_BYTES = 128 * 1024 * 1024  # Decoded preview images kept in memory
+THUMBNAIL_WORKERS = 6
+THUMBNAIL_READY_ENTRIES = 60  # Scaled thumbnails kept ready for display
+THUMBNAIL_PHOTO_ENTRIES = 30  # Display-ready PhotoImages kept per asset id
+THUMBNAIL_REFRESH_DELAY_MS = 40  # Thumbnail grid rebuild is deferred so held arrow keys skip it
+RENDER_BACKEND = "auto"  # "auto" (OpenGL, CPU fallback), "gl" or "cpu"
+GPU_TEXTURE_CACHE_BYTES = 256 * 1024 * 1024  # Uploaded preview textures kept in VRAM
+EXPORT_FOLDER = "staging/adjusted"  # Output of export_adjusted.py
+TRACE_FILE = "trace.json"  # Chrome trace JSON written on exit when SET_PROFILER is on
+TRACE_BUFFER_SIZE = 100000  # Most recent spans kept for the trace
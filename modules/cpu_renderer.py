@@ -0,0 +1,185 @@
+import time
+import numpy as np
+from PIL import Image
+
+from modules.render_state import RenderState, prepare_texture_image
+
+
+def sample_bilinear(texture, u, v):
+    """
+    Sample an (h, w, 3) float texture at normalized coordinates like GL_LINEAR with GL_REPEAT.
+
+    Texel centers sit at (i + 0.5) / size and row 0 of the texture is at v = 0,
+    as uploaded by OffscreenRenderer.update_texture.
+    """
+    height, width = texture.shape[:2]
+    x = u * width - 0.5
+    y = v * height - 0.5
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    fx = (x - x0)[..., None]
+    fy = (y - y0)[..., None]
+    x0 = x0.astype(np.int64) % width
+    y0 = y0.astype(np.int64) % height
+    x1 = (x0 + 1) % width
+    y1 = (y0 + 1) % height
+
+    top = texture[y0, x0] * (1 - fx) + texture[y0, x1] * fx
+    bottom = texture[y1, x0] * (1 - fx) + texture[y1, x1] * fx
+    return top * (1 - fy) + bottom * fy
+
+
+def step(edge, x):
+    return (x >= edge).astype(np.float32)
+
+
+def mix(x, y, a):
+    return x * (1 - a) + y * a
+
+
+def rgb_to_hsv(color):
+    """Branchless RGB -> HSV, the same formulation as RGBtoHSV in default.frag."""
+    r, g, b = color[..., 0], color[..., 1], color[..., 2]
+    k = np.array([0.0, -1.0 / 3.0, 2.0 / 3.0, -1.0], dtype=np.float32)
+    zeros = np.zeros_like(r)
+
+    s = step(b, g)[..., None]
+    p = mix(np.stack([b, g, zeros + k[3], zeros + k[2]], axis=-1),
+            np.stack([g, b, zeros + k[0], zeros + k[1]], axis=-1), s)
+    t = step(p[..., 0], r)[..., None]
+    q = mix(np.stack([p[..., 0], p[..., 1], p[..., 3], r], axis=-1),
+            np.stack([r, p[..., 1], p[..., 2], p[..., 0]], axis=-1), t)
+
+    d = q[..., 0] - np.minimum(q[..., 3], q[..., 1])
+    e = np.float32(1.0e-10)
+    return np.stack([
+        np.abs(q[..., 2] + (q[..., 3] - q[..., 1]) / (6.0 * d + e)),
+        d / (q[..., 0] + e),
+        q[..., 0],
+    ], axis=-1)
+
+
+def hsv_to_rgb(color):
+    """HSV -> RGB, the same formulation as HSVtoRGB in default.frag."""
+    k = np.array([1.0, 2.0 / 3.0, 1.0 / 3.0, 3.0], dtype=np.float32)
+    h = color[..., 0:1]
+    shifted = h + k[:3]
+    p = np.abs((shifted - np.floor(shifted)) * 6.0 - k[3])
+    return color[..., 2:3] * mix(k[0], np.clip(p - k[0], 0.0, 1.0), color[..., 1:2])
+
+
+def adjust_overlay(texture, u, v, rot, hue, sat, val, scale=1.0):
+    """
+    The overlay half of default.frag: sample at UVs rotated by rot degrees, shift the
+    hue by hue degrees and scale saturation and value. Returns float RGB at (u, v).
+
+    Samples are multiplied by scale, so integer textures can be passed as they are
+    (scale 1 / 255 for 8-bit) and only the sampled values are converted to float.
+    """
+    # rotate(): mat2(c, -s, s, c) * tex, with GLSL's column-major matrices
+    angle = np.radians(np.float32(rot))
+    s, c = np.sin(angle), np.cos(angle)
+    color = sample_bilinear(texture, c * u + s * v, -s * u + c * v) * np.float32(scale)
+
+    hsv = rgb_to_hsv(color)
+    # hue is between -180 and 180
+    shifted = hsv[..., 0] + np.float32(hue / 360.0)
+    shifted = np.where(shifted > 1.0, shifted - 1.0, np.where(shifted < 0.0, shifted + 1.0, shifted))
+    hsv = np.stack([shifted, hsv[..., 1] * sat, hsv[..., 2] * val], axis=-1)
+    return hsv_to_rgb(hsv)
+
+
+class CpuRenderer:
+    """NumPy implementation of the preview pipeline in assets/shaders/default.frag.
+
+    It has the same interface as OffscreenRenderer (update_texture, set_size,
+    set_shader, render, release) and is used when no OpenGL 3.3 context can be
+    created. Each fragment is evaluated at its pixel center with GL-style
+    bilinear, repeating texture lookups, and the result goes through the same
+    bottom-up readback as the GL path, so both backends produce the same image.
+    """
+
+    def __init__(self, width=640, height=480):
+        self.width = width
+        self.height = height
+        self.uses_time = False
+
+        # Initialize texture and shader state
+        self.textures = [np.zeros((1, 1, 3), dtype=np.float32) for _ in range(2)]
+        self.mix_ratio = 0.0
+        self.rot = 0.0
+        self.hue = 0.0
+        self.sat = 1.0
+        self.val = 1.0
+        self.hsvToggle = 0.0
+
+    def update_texture(self, image, texture_index=0):
+        """Updates one of the textures with a new image."""
+        if texture_index not in [0, 1]:
+            raise ValueError("texture_index must be 0 or 1")
+        image = prepare_texture_image(image)
+        self.textures[texture_index] = np.asarray(image, dtype=np.float32) / 255.0
+
+    def set_size(self, width, height):
+        """Resize the output."""
+        if width <= 0 or height <= 0:
+            return
+        self.width = width
+        self.height = height
+
+    def set_shader(self, vertex_source_or_file="default.vert", fragment_source_or_file="default.frag", is_file=True):
+        """Only the default preview shader is implemented on the CPU."""
+        if fragment_source_or_file != "default.frag":
+            print(f"CPU renderer only implements default.frag; ignoring {fragment_source_or_file}")
+
+    def current_state(self):
+        """Snapshot of the renderer's own uniform attributes (used when no state is published)."""
+        return RenderState(self.mix_ratio, self.rot, self.hue, self.sat, self.val, self.hsvToggle)
+
+    def shade(self, state):
+        """Evaluate default.frag for every pixel; returns float RGB rows from the bottom up, like the framebuffer."""
+        # TexCoord at each pixel center; row 0 is the bottom of the framebuffer
+        u = (np.arange(self.width, dtype=np.float32) + 0.5) / self.width
+        v = (np.arange(self.height, dtype=np.float32) + 0.5) / self.height
+        u, v = np.meshgrid(u, v)
+
+        tex_color1 = sample_bilinear(self.textures[0], u, v)
+        tex_color2 = adjust_overlay(self.textures[1], u, v, state.rot, state.hue, state.sat, state.val)
+
+        # Blend the two textures
+        blend = step(1.0 - np.float32(state.mix_ratio), 1.0 - v)[..., None]
+        blended = mix(tex_color1, tex_color2, blend)
+
+        if state.hsvToggle == 1.0:
+            # 3 stripes from UV showing hsv.x, hsv.y, hsv.z
+            hsv = rgb_to_hsv(blended)
+            channel = np.where(u < 0.33, 0, np.where(u < 0.66, 1, 2))
+            stripe = np.take_along_axis(hsv, channel[..., None], axis=-1)
+            blended = np.repeat(stripe, 3, axis=-1)
+        return blended
+
+    def render(self, state=None):
+        """Render the scene for a RenderState (default: the renderer's attributes) and return the image."""
+        if state is None:
+            state = self.current_state()
+        else:
+            self.mix_ratio, self.rot, self.hue, self.sat, self.val, self.hsvToggle = state
+
+        start = time.perf_counter_ns()
+        color = self.shade(state)
+        timings = {'draw': time.perf_counter_ns() - start}
+
+        # Normalized float -> unorm8 as the framebuffer stores it
+        start = time.perf_counter_ns()
+        pixels = np.floor(np.clip(color, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+        timings['readback'] = time.perf_counter_ns() - start
+
+        # Same bottom-up row order and flip as the GL readback
+        start = time.perf_counter_ns()
+        image = Image.frombytes('RGB', (self.width, self.height), pixels.tobytes(), 'raw', 'RGB', 0, -1)
+        timings['convert'] = time.perf_counter_ns() - start
+        return image, timings
+
+    def release(self):
+        """Nothing to free; kept for interface parity with OffscreenRenderer."""
+        self.textures = [np.zeros((1, 1, 3), dtype=np.float32) for _ in range(2)]
@@ -2,6 +2,7 @@ import os
 import json
 
 from modules.constants import DB_FILE
+from modules.instrumentation import traced
 
 def load_database():
     if os.path.exists(DB_FILE):
@@ -12,6 +13,7 @@ def load_database():
         return db
     return {"textures": {}}
 
+@traced(category="io")
 def save_database(db):
     with open(DB_FILE, "w") as f:
         json.dump(db, f, indent=4)
\ No newline at end of file
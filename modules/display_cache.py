@@ -0,0 +1,127 @@
+import os
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError
+
+from modules.constants import DISPLAY_CACHE_MAX_BYTES, DISPLAY_IMAGE_HEIGHT, DISPLAY_WORKERS
+
+
+class DisplayImageCache:
+    """LRU cache of decoded, display-sized preview images.
+
+    Entries are keyed by (path, mtime, height), so a texture or overlay that is
+    rewritten on disk (e.g. by the compose stage) is decoded again, and are
+    evicted least recently used first once their pixels exceed max_bytes.
+    load_async() and prefetch() decode images on worker threads and return
+    futures; a queued load that is no longer wanted can be dropped with
+    future.cancel() and is submitted again by the next request for it.
+
+    loader(path, height) must return a PIL image, or None if the file cannot be
+    decoded. Cached images are shared: callers must not modify them in place.
+    """
+
+    def __init__(self, loader, max_bytes=DISPLAY_CACHE_MAX_BYTES, height=DISPLAY_IMAGE_HEIGHT, max_workers=DISPLAY_WORKERS):
+        self.loader = loader
+        self.max_bytes = max_bytes
+        self.height = height
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="display-load")
+
+    def key(self, path):
+        """Return the cache key for path, or None if the file does not exist."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return os.path.normcase(os.path.normpath(path)), mtime, self.height
+
+    def get(self, path):
+        """Return the display image for path, decoding it now if it is not cached."""
+        key = self.key(path)
+        if key is None:
+            return None
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            future = self.pending.get(key)
+
+        if future is not None:
+            # Already being prefetched; waiting is cheaper than decoding twice
+            try:
+                return future.result()
+            except CancelledError:
+                pass
+        return self._load(key, path)
+
+    def load_async(self, path):
+        """Return a future for path's display image; cached images give a completed future."""
+        key = self.key(path)
+        if key is not None:
+            with self.lock:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    image = self.entries[key]
+                else:
+                    return self._submit(key, path)
+        else:
+            image = None
+        future = Future()
+        future.set_result(image)
+        return future
+
+    def prefetch(self, paths):
+        """Decode paths in the background if they are not cached; returns the futures of uncached paths."""
+        futures = []
+        for path in paths:
+            key = self.key(path)
+            if key is None:
+                continue
+            with self.lock:
+                if key not in self.entries:
+                    futures.append(self._submit(key, path))
+        return futures
+
+    def _submit(self, key, path):
+        """Queue a load unless one is already pending; call with the lock held."""
+        future = self.pending.get(key)
+        if future is None or future.cancelled():
+            future = self.executor.submit(self._load, key, path)
+            self.pending[key] = future
+        return future
+
+    def _load(self, key, path):
+        try:
+            image = self.loader(path, self.height)
+        except Exception as e:
+            print(f"Failed to prepare display image {path}: {e}")
+            image = None
+
+        with self.lock:
+            self.pending.pop(key, None)
+            if image is not None and key not in self.entries:
+                self.entries[key] = image
+                self.total_bytes += self.image_bytes(image)
+                self._evict()
+        return image
+
+    def image_bytes(self, image):
+        return image.width * image.height * len(image.getbands())
+
+    def _evict(self):
+        """Drop least recently used images until the cache fits in max_bytes (keeps the newest)."""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, image = self.entries.popitem(last=False)
+            self.total_bytes -= self.image_bytes(image)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
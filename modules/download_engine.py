@@ -0,0 +1,97 @@
+import os
+import hashlib
+import threading
+import requests
+
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+from modules.constants import DOWNLOAD_WORKERS, DOWNLOAD_CHUNK_SIZE, DOWNLOAD_TIMEOUT
+from modules.md5_cache import hash_file
+
+
+class DownloadEngine:
+    """Concurrent file downloader sharing one pooled requests.Session.
+
+    Files are streamed to a `.part` temp file in fixed-size chunks and renamed
+    into place only once complete, so memory per transfer is bounded by the
+    chunk size and a half-written file never takes the final name. Partial
+    files are kept on failure so the next attempt can resume them.
+    Concurrent submits for the same file_path share one transfer.
+    """
+
+    def __init__(self, max_workers=DOWNLOAD_WORKERS, chunk_size=DOWNLOAD_CHUNK_SIZE, timeout=DOWNLOAD_TIMEOUT):
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "pbrmatcher"
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=2)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="download")
+
+        # Running transfers by destination, so one asset queued for several textures downloads once
+        self.in_flight = {}
+        self.lock = threading.Lock()
+
+    def get_json(self, url):
+        """Fetch and decode a JSON document through the shared session."""
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def download_file(self, url, file_path, expected_md5=None):
+        """Stream url into file_path via a temp file and atomic rename. Returns the file's MD5.
+
+        A `.part` file left behind by an interrupted transfer is resumed with an
+        HTTP Range request; servers that ignore the range get a full restart.
+        The digest is computed as the bytes arrive, and a mismatch against
+        expected_md5 discards the file and raises IOError.
+        """
+        temp_path = f"{file_path}.part"
+        offset = os.path.getsize(temp_path) if os.path.exists(temp_path) else 0
+
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with self.session.get(url, stream=True, timeout=self.timeout, headers=headers) as response:
+            resumed = offset and response.status_code in (206, 416)
+            if response.status_code != 416 or not offset:
+                response.raise_for_status()
+
+            # Only the bytes already on disk from an earlier run need reading back
+            hash_md5 = hash_file(temp_path) if resumed else hashlib.md5()
+            if response.status_code != 416:
+                with open(temp_path, "ab" if resumed else "wb") as file:
+                    for chunk in response.iter_content(self.chunk_size):
+                        file.write(chunk)
+                        hash_md5.update(chunk)
+
+        md5_hash = hash_md5.hexdigest()
+        if expected_md5 and md5_hash != expected_md5:
+            os.remove(temp_path)
+            raise IOError(f"MD5 mismatch for {url}: expected {expected_md5}, got {md5_hash}")
+        os.replace(temp_path, file_path)
+        return md5_hash
+
+    def submit(self, url, file_path, expected_md5=None):
+        """Queue a download on the worker pool and return its Future, or the Future of a running transfer to file_path."""
+        key = os.path.normcase(os.path.abspath(file_path))
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                return future
+            future = self.executor.submit(self.download_file, url, file_path, expected_md5)
+            self.in_flight[key] = future
+        # Outside the lock: an already finished future runs the callback right here
+        future.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        with self.lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def shutdown(self, wait=False):
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+        self.session.close()
@@ -1,17 +1,28 @@
 import os
+import json
+import queue
 import requests
 import threading
-import hashlib
 import re
+import time
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from tkinter import messagebox
 from urllib.parse import urlparse
 
+from modules.constants import DOWNLOAD_ASSET_WORKERS, DOWNLOAD_QUEUE_FILE, POLYHAVEN_API_URL, COMPOSE_WORKERS, COMPOSE_QUEUE_SIZE
+from modules.download_engine import DownloadEngine
+from modules.md5_cache import Md5Cache
+from modules.staging_index import staging_index
+from modules.resolution_policy import needed_resolution, select_files
 from modules.utility_functions import get_key_by_name
-from modules.texture_operations import TextureOperations
+from modules.texture_operations import TextureOperations, compose_texture
+from modules.instrumentation import tracer, span, traced
 
 class DownloadManager:
-    def __init__(self, db, root, progress_bar, progress_label, all_assets):
+    def __init__(self, db, root, progress_bar, progress_label, all_assets, api_url=POLYHAVEN_API_URL):
         self.db = db
         self.root = root
         self.progress_bar = progress_bar
@@ -21,7 +32,62 @@ class DownloadManager:
         self.in_progress = []
         self.currently_downloading = False
         self.all_assets = all_assets
+        self.api_url = api_url
         self.texture_operations = TextureOperations(db, all_assets)
+        self.engine = DownloadEngine()
+        self.asset_executor = ThreadPoolExecutor(max_workers=DOWNLOAD_ASSET_WORKERS, thread_name_prefix="asset")
+        self.lock = threading.RLock()
+        self.files_total = 0
+        self.files_done = 0
+        self.actual_progress = 0
+        self.smoothed_progress = 0
+        self.progress_updating = False
+
+        # Items whose files are still downloading; the rest of in_progress is being composed
+        self.active_downloads = 0
+        # Download stage -> compose stage hand-off. Bounded so downloads stall instead of piling up work
+        self.compose_queue = queue.Queue(maxsize=COMPOSE_QUEUE_SIZE)
+        self.compose_slots = threading.Semaphore(COMPOSE_WORKERS)
+        self.compose_executor = None
+        self.compose_thread = None
+        # Assets being composed. Both composes of one asset write its overlay, so a second
+        # one is parked until the first finishes while other assets keep dispatching
+        self.composing_assets = set()
+        self.parked_composes = {}
+        self.compose_lock = threading.Lock()
+
+        self.md5_cache = Md5Cache()
+        self.load_queue_state()
+        if self.download_queue:
+            print(f"Resuming {len(self.download_queue)} queued downloads from the previous session")
+            self.root.after(0, self.process_queue)
+
+    def load_queue_state(self):
+        """Restore the queue saved by a previous session."""
+        if not os.path.exists(DOWNLOAD_QUEUE_FILE):
+            return
+        try:
+            with open(DOWNLOAD_QUEUE_FILE, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load download queue: {e}")
+            return
+
+        # Items that were mid-download when the app closed go first
+        self.download_queue = [tuple(item) for item in state.get("in_progress", []) + state.get("pending", [])]
+
+    def save_queue_state(self):
+        """Write the pending and in-progress items to disk."""
+        with self.lock:
+            state = {
+                "pending": self.download_queue,
+                "in_progress": self.in_progress,
+            }
+            temp_path = f"{DOWNLOAD_QUEUE_FILE}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(temp_path, DOWNLOAD_QUEUE_FILE)
+
 
 
     def add_to_queue(self, current_texture, thumbnail_name, texture_name_label, selected_slot):
@@ -32,22 +98,22 @@ class DownloadManager:
 
         # Add to the queue
         self.download_queue.append((current_texture, thumbnail_name, texture_name_label))
+        self.save_queue_state()
         #print(f"[DEBUG] Added to queue: path: {current_texture}, Texture: {texture_name_label}, Thumbnail: {thumbnail_name}")
         #print(f"[DEBUG] Current Queue Length: {len(self.download_queue)}")
 
-        # Start processing the queue if idle
-        if not self.currently_downloading:
-            self.process_queue()
+        # Start processing the queue if there are free download slots
+        self.process_queue()
 
         self.update_progress_label()
 
-    def add_all_to_queue(self):
+    def add_all_to_queue(self, texture_paths):
         """Add all textures and their selected thumbnails to the download queue, with confirmation."""
-        if not self.filtered_texture_paths:
+        if not texture_paths:
             messagebox.showerror("Error", "No textures available to add to the queue.")
             return
 
-        for texture_path in self.filtered_texture_paths:
+        for texture_path in texture_paths:
             #selected_thumbnails = self.db["textures"].get(texture_path, {}).get("selected_thumbnails", [])
 
             selected_thumbnails = [
@@ -73,83 +139,34 @@ class DownloadManager:
         )
         if not confirm:
             return
+        self.save_queue_state()
 
         # Print debug information
         #print(f"[DEBUG] Added all textures to queue. Current Queue Length: {len(self.download_queue)}")
 
-        # Start processing the queue if idle
-        if not self.currently_downloading:
-            self.process_queue()
+        # Start processing the queue if there are free download slots
+        self.process_queue()
 
         self.update_progress_label()
 
     def process_queue(self):
-        """Start processing the download queue."""
-        if not self.download_queue:
-            self.currently_downloading = False  # No more items in the queue
-            messagebox.showinfo("Queue", "All downloads completed.")
-            return
-
-        # Get the next item from the queue and remove it
-        next_item = self.download_queue.pop(0)
-        next_texture, next_thumbnail, next_texture_name_label = next_item
-
-        #print("DEBUG", next_texture)
-
-        # Move this item to 'in progress'
-        self.in_progress.append(next_item)
-
-        # Start the download for this texture, thumbnail, and texture name label
-        self.currently_downloading = True
-
-        self.update_progress_label()  # Update after moving item to in-progress
-
-        self.download_texture(next_texture, next_thumbnail, next_texture_name_label)
-        #print("[DEBUG] texture:", next_texture)
-        #print("[DEBUG] thumbnail:", next_thumbnail)
-        #print("[DEBUG] name label:", next_texture_name_label)
-
-        # Debugging output for current queue state
-        #print("[DEBUG] Completed Downloads:", self.completed_downloads)
-        #print("[DEBUG] In Progress:", self.in_progress)
-        #print("[DEBUG] Pending Downloads:", self.download_queue)
-
-    def download_texture(self, texture_path, thumbnail_name, texture_name_label):
-        """Start the download process for a specific texture, thumbnail, and label."""
-        self.progress_bar["value"] = 0
-        self.progress_bar["maximum"] = 100
-
-        def smooth_progress_update():
-            """Gradually update the progress bar."""
-            if self.smoothed_progress < self.actual_progress:
-                self.smoothed_progress += (self.actual_progress - self.smoothed_progress) * 0.1
-                self.progress_bar["value"] = min(self.smoothed_progress, 100)
-            if self.smoothed_progress < 100:
-                self.root.after(50, smooth_progress_update)
-
-        smooth_progress_update()
-        download_thread = threading.Thread(
-            target=self._perform_download, args=(texture_path, thumbnail_name, texture_name_label), daemon=True
-        )
-        download_thread.start()
-
-    def _perform_download(self, texture_path, thumbnail_name, texture_name_label):
-        """Perform the actual download process for a specific texture and thumbnail."""
-        try:
-            # Download logic here
-            pass
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred during download: {e}")
-        finally:
-            self.update_progress_label()
-            self.in_progress.remove((texture_path, thumbnail_name, texture_name_label))
-            self.completed_downloads.append((texture_path, thumbnail_name, texture_name_label))
-            if self.download_queue:
-                self.process_queue()
-            else:
-                self.currently_downloading = False
-                messagebox.showinfo("Queue", "All downloads completed.")
-                self.update_progress_label()
+        """Start queued items until the concurrent asset limit is reached."""
+        started = []
+        with self.lock:
+            while self.download_queue and self.active_downloads < DOWNLOAD_ASSET_WORKERS:
+                # Get the next item from the queue and move it to 'in progress'
+                next_item = self.download_queue.pop(0)
+                self.in_progress.append(next_item)
+                self.active_downloads += 1
+                started.append(next_item)
+            self.currently_downloading = bool(self.in_progress)
+            if started:
+                self.save_queue_state()
+
+        self.update_progress_label()  # Update after moving items to in-progress
+
+        for next_texture, next_thumbnail, next_texture_name_label in started:
+            self.download_texture(next_texture, next_thumbnail, next_texture_name_label)
 
     def update_progress_label(self):
         """Update the progress label with the current counts of completed, in-progress, and pending downloads."""
@@ -182,15 +199,15 @@ class DownloadManager:
         queue_text += "Completed:\n"
         if total_completed > 0:
             for texture_path, thumbnail_name, texture_name_label in self.completed_downloads:
-                queue_text += f"  - Texture: {texture_name_label}, Thumbnail: {thumbnail_name} [finished]\n"
+                queue_text += f"  - Texture: {texture_name_label}, Thumbnail: {self.asset_name(thumbnail_name)} [finished]\n"
         else:
             queue_text += "  None\n"
 
-        # Add in-progress item
+        # Add in-progress items
         queue_text += "\nIn Progress:\n"
         if total_in_progress > 0:
             for texture_path, thumbnail_name, texture_name_label in self.in_progress:
-                queue_text += f"  - Texture: {texture_name_label}, Thumbnail: {thumbnail_name} [in progress]\n"
+                queue_text += f"  - Texture: {texture_name_label}, Thumbnail: {self.asset_name(thumbnail_name)} [in progress]\n"
         else:
             queue_text += "  None\n"
 
@@ -198,171 +215,285 @@ class DownloadManager:
         queue_text += "\nPending:\n"
         if total_pending > 0:
             for texture_path, thumbnail_name, texture_name_label in self.download_queue:
-                queue_text += f"  - Texture: {texture_name_label}, Thumbnail: {thumbnail_name}\n"
+                queue_text += f"  - Texture: {texture_name_label}, Thumbnail: {self.asset_name(thumbnail_name)}\n"
         else:
             queue_text += "  None\n"
 
-        # Debugging output
-        #print("[DEBUG] Completed Downloads:", self.completed_downloads)
-        #print("[DEBUG] In Progress:", self.in_progress)
-        #print("[DEBUG] Pending Downloads:", self.download_queue)
-        #print(f"[DEBUG] Current Queue Length: {len(self.download_queue)}")
-        #print("[DEBUG] Queue Text:", queue_text)
-
         # Display the queue in a message box
         messagebox.showinfo("Download Queue", queue_text)
     
     def download_texture(self, texture_path, thumbnail_name, texture_name_label):
         """Start the download process for a specific texture, thumbnail, and label."""
-        self.progress_bar["value"] = 0
-        self.progress_bar["maximum"] = 100  # Assume 100 steps for simplicity
-
-        # Reset progress tracking
-        self.actual_progress = 0
-        self.smoothed_progress = 0
+        # Start smooth progress updates unless they are already running for the current batch
+        if not self.progress_updating:
+            self.progress_bar["value"] = 0
+            self.progress_bar["maximum"] = 100
+            self.actual_progress = 0
+            self.smoothed_progress = 0
+            self.progress_updating = True
+            self.smooth_progress_update()
+
+        # Run the download on the asset pool; file transfers fan out to the engine's pool
+        self.asset_executor.submit(self._perform_download, texture_path, thumbnail_name, texture_name_label)
+
+    def smooth_progress_update(self):
+        """Gradually update the progress bar."""
+        if self.smoothed_progress < self.actual_progress:
+            self.smoothed_progress += (self.actual_progress - self.smoothed_progress) * 0.1
+            self.progress_bar["value"] = min(self.smoothed_progress, 100)
+        if self.currently_downloading:
+            self.root.after(50, self.smooth_progress_update)
+        else:
+            self.progress_updating = False
 
-        def smooth_progress_update():
-            """Gradually update the progress bar."""
-            if self.smoothed_progress < self.actual_progress:
-                self.smoothed_progress += (self.actual_progress - self.smoothed_progress) * 0.1
-                self.progress_bar["value"] = min(self.smoothed_progress, 100)
-            if self.smoothed_progress < 100:
-                self.root.after(50, smooth_progress_update)
+    def count_files(self, total=0, done=0):
+        """Record newly discovered and finished files and recompute the overall progress."""
+        with self.lock:
+            self.files_total += total
+            self.files_done += done
+            if self.files_total:
+                self.actual_progress = 100 * self.files_done / self.files_total
 
-        # Start smooth progress update
-        smooth_progress_update()
+    def calculate_md5(self, file_path):
+        """Calculate the MD5 hash of a file, reusing the cached digest if the file is unchanged."""
+        return self.md5_cache.digest(file_path)
 
-        # Start the download in a separate thread
-        download_thread = threading.Thread(
-            target=self._perform_download, args=(texture_path, thumbnail_name, texture_name_label), daemon=True
-        )
-        download_thread.start()
+    def asset_name(self, thumbnail_name):
+        """Queue items carry either the selected-thumbnail dict or the bare asset name."""
+        return thumbnail_name["name"] if isinstance(thumbnail_name, dict) else thumbnail_name
 
-    def calculate_md5(self, file_path):
-        """Calculate the MD5 hash of a file."""
-        hash_md5 = hashlib.md5()
-        try:
-            with open(file_path, "rb") as file:
-                for chunk in iter(lambda: file.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except FileNotFoundError:
-            return None
+    def show_error(self, title, message):
+        """Show an error dialog from a worker thread via the Tk event loop."""
+        self.root.after(0, lambda: messagebox.showerror(title, message))
         
+    @traced("download.item", category="download")
     def _perform_download(self, texture_path, thumbnail_name, texture_name_label):
         """Perform the actual download process for a specific texture and thumbnail."""
+        item = (texture_path, thumbnail_name, texture_name_label)
+        asset_name = self.asset_name(thumbnail_name)
+        queued_for_compose = False
         try:
-            thumbnail_name = thumbnail_name["name"]            
-            print("get key by name line 256: ", thumbnail_name)
-            print("ALL ASSETS: ", self.all_assets)
-            texture_id_download = get_key_by_name(self.all_assets, thumbnail_name)
+            texture_id_download = get_key_by_name(self.all_assets, asset_name)
             print("texture id:", texture_id_download)
-            
 
             texture_path = os.path.normpath(texture_path.strip())
             texture_name_label = texture_name_label.strip()
 
-            
             # Construct the download URL
-            url = f"https://api.polyhaven.com/files/{texture_id_download}"
-
-            print("url: ", url)
-
+            url = f"{self.api_url}/files/{texture_id_download}"
 
             # Create the "staging" folder if it doesn't exist
-            if not os.path.exists("staging"):
-                os.makedirs("staging")
+            os.makedirs("staging", exist_ok=True)
             
             # Fetch texture metadata
-            data = requests.get(url)
-            if data.status_code != 200:
-                messagebox.showerror("Error", f"Failed to fetch texture metadata for '{thumbnail_name}'. Status code: {data.status_code}")
+            try:
+                with span("download.metadata", "download", asset=texture_id_download):
+                    data = self.engine.get_json(url)
+            except requests.RequestException as e:
+                self.show_error("Error", f"Failed to fetch texture metadata for '{asset_name}': {e}")
                 return
 
             # Extract URLs and MD5 checksums
-            texture_files = self.extract_files_with_md5(data.json())
-
-            # Filter files based on required file types
-            required_files = ["_diffuse_4k.png", "_diff_4k.png", "_color_4k.png", "_nor_dx_4k.png", "_arm_4k.png", "_disp_4k.png", "_height_4k.png"]
-            filtered_files = {
-                file_info['url']: file_info['md5']
-                for file_info in texture_files
-                if any(required_file in file_info['url'] for required_file in required_files)
-            }
+            texture_files = self.extract_files_with_md5(data)
+
+            # Pick the smallest resolution and format per map that still covers the target texture
+            selected_files = select_files(texture_files, needed_resolution(texture_path))
+            filtered_files = {file_info['url']: file_info['md5'] for file_info in selected_files.values()}
 
             if not filtered_files:
-                messagebox.showerror("Error", f"No valid files to download for '{thumbnail_name}'.")
+                self.show_error("Error", f"No valid files to download for '{asset_name}'.")
                 return
 
-            # Set the progress bar maximum value
-            self.progress_bar["maximum"] = len(filtered_files)
-
-            # Download files
-            for idx, (texture_url, md5_hash) in enumerate(filtered_files.items()):
-                # Update the progress bar
-                self.actual_progress = idx + 1
+            self.count_files(total=len(filtered_files))
 
+            # Download files concurrently
+            files_start_ns = time.perf_counter_ns()
+            pending = {}
+            for texture_url, md5_hash in filtered_files.items():
                 # Sanitize the URL to create a valid filename
                 sanitized_filename = self.sanitize_filename(texture_url)
                 file_path = os.path.join("staging", sanitized_filename)
 
                 # Check if the file already exists and matches the MD5 hash
-                if os.path.exists(file_path) and self.calculate_md5(file_path) == md5_hash:
+                if self.calculate_md5(file_path) == md5_hash:
                     print(f"File already exists and matches MD5: {file_path}")
+                    staging_index.add(file_path)
+                    self.count_files(done=1)
                     continue
 
-                # Download the texture
-                response = requests.get(texture_url)
-                if response.status_code == 200:
-                    with open(file_path, "wb") as file:
-                        file.write(response.content)
-                else:
-                    print(f"Failed to download: {texture_url} (Status: {response.status_code})")
-
-            # Combine the downloaded textures
-            self.texture_operations.combine_textures(texture_path, texture_id_download, texture_name_label)
+                pending[self.engine.submit(texture_url, file_path, md5_hash)] = (texture_url, file_path)
+
+            for future in as_completed(pending):
+                texture_url, file_path = pending[future]
+                try:
+                    # The digest was computed while streaming, so record it instead of rehashing later
+                    self.md5_cache.record(file_path, future.result())
+                    staging_index.add(file_path)
+                except (requests.RequestException, OSError) as e:
+                    print(f"Failed to download: {texture_url} ({e})")
+                finally:
+                    self.count_files(done=1)
+            self.md5_cache.save()
+            if tracer.enabled:
+                tracer.record("download.files", "download", files_start_ns, time.perf_counter_ns(),
+                              {"asset": texture_id_download, "files": len(filtered_files)})
+
+            # Hand the combine step to the compose stage; blocks while that stage is saturated
+            self.start_compose_stage()
+            staged_files = {
+                role: os.path.join("staging", self.sanitize_filename(file_info['url']))
+                for role, file_info in selected_files.items()
+            }
+            self.compose_queue.put((item, texture_path, texture_id_download, texture_name_label, staged_files))
+            queued_for_compose = True
 
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred during download: {e}")
+            self.show_error("Error", f"An error occurred during download: {e}")
 
         finally:
-            try:
-                # Update the progress label
-                self.update_progress_label()
-
-                # Debug: Check tuple being removed
-                normalized_tuple = (texture_path, thumbnail_name, texture_name_label)
-                #print("[DEBUG] Trying to remove (normalized):", repr(normalized_tuple))
-
-                # Remove from in-progress and add to completed
-                if normalized_tuple in self.in_progress:
-                    self.in_progress.remove(normalized_tuple)
-                    #print("[DEBUG] Successfully removed:", repr(normalized_tuple))
-                else:
-                    print("[DEBUG] Item not found in in_progress for removal:", repr(normalized_tuple))
-
-                self.completed_downloads.append(normalized_tuple)
-                #print("[DEBUG] Added to completed_downloads:", repr(normalized_tuple))
-            except Exception as e:
-                print(f"[DEBUG] Error during in_progress removal or completion update: {e}")
-
-            # Check if there are more items in the queue
-            if self.download_queue:
-                # Process the next item in the queue
-                self.process_queue()
+            with self.lock:
+                self.active_downloads -= 1
+            if queued_for_compose:
+                # The item stays in progress until composed, but its download slot is free
+                self.root.after(0, self.process_queue)
             else:
-                self.currently_downloading = False
-                messagebox.showinfo("Queue", "All downloads completed.")
-                self.update_progress_label()
-                self.completed_downloads = []
+                self.finish_item(item)
 
-            # Debugging output
-            #"[DEBUG] Completed Downloads:", self.completed_downloads)
-            #print("[DEBUG] In Progress:", self.in_progress)
-            #print("[DEBUG] Pending Downloads:", self.download_queue)
+    def start_compose_stage(self):
+        """Create the compose process pool and its dispatcher thread on first use."""
+        with self.lock:
+            if self.compose_thread is not None:
+                return
+            self.compose_executor = ProcessPoolExecutor(max_workers=COMPOSE_WORKERS)
+            self.compose_thread = threading.Thread(target=self.compose_dispatcher, daemon=True)
+            self.compose_thread.start()
+
+    def compose_dispatcher(self):
+        """Feed downloaded assets to the process pool, at most COMPOSE_WORKERS at a time."""
+        while True:
+            job = self.compose_queue.get()
+            texture_id = job[2]
+            with self.compose_lock:
+                if texture_id in self.composing_assets:
+                    self.parked_composes.setdefault(texture_id, deque()).append(job)
+                    continue
+                self.composing_assets.add(texture_id)
+            self.submit_compose(job)
+
+    def submit_compose(self, job, attempt=0):
+        """
+        Start one compose job once a compose slot is free.
+
+        A crashed worker breaks the whole pool, which only shows when the next
+        submit raises BrokenProcessPool; the job is fine, so the submit is retried
+        once on a fresh pool. Jobs that were in flight when a pool broke come back
+        with attempt=1 and run alone in a single-worker pool, so the job that
+        crashed its worker fails on its own instead of breaking the others again.
+        """
+        item, texture_path, texture_id, texture_name_label, staged_files = job
+        self.compose_slots.acquire()
+        submitted_ns = time.perf_counter_ns()
+        if attempt:
+            executor = ProcessPoolExecutor(max_workers=1)
+            future = executor.submit(compose_texture, texture_path, texture_id, texture_name_label, staged_files)
+            future.add_done_callback(lambda future: executor.shutdown(wait=False))
+        else:
+            for retry in (False, True):
+                executor = self.compose_executor
+                try:
+                    future = executor.submit(compose_texture, texture_path, texture_id, texture_name_label, staged_files)
+                    break
+                except BrokenProcessPool as e:
+                    self.restart_compose_pool(executor)
+                    if retry:
+                        self.fail_compose(job, e)
+                        return
+                except Exception as e:
+                    self.fail_compose(job, e)
+                    return
+        future.add_done_callback(lambda future: self.on_composed(job, attempt, executor, future, submitted_ns))
+
+    def fail_compose(self, job, error):
+        """Give up on a compose job that could not be started."""
+        item, _, texture_id, texture_name_label, _ = job
+        self.compose_slots.release()
+        self.show_error("Error", f"Could not start combining textures for '{texture_name_label}': {error}")
+        self.finish_compose(texture_id)
+        self.finish_item(item)
+
+    def restart_compose_pool(self, broken):
+        """Replace a broken compose process pool, unless another thread already has."""
+        with self.compose_lock:
+            if self.compose_executor is not broken:
+                return
+            self.compose_executor = ProcessPoolExecutor(max_workers=COMPOSE_WORKERS)
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def finish_compose(self, texture_id):
+        """Start the next parked compose of the asset, or mark the asset idle."""
+        with self.compose_lock:
+            parked = self.parked_composes.get(texture_id)
+            if not parked:
+                self.composing_assets.discard(texture_id)
+                return
+            job = parked.popleft()
+            if not parked:
+                del self.parked_composes[texture_id]
+        self.resubmit_compose(job)
+
+    def resubmit_compose(self, job, attempt=0):
+        # Own thread: taking a compose slot may block, and callers include the pool's callback thread
+        threading.Thread(target=self.submit_compose, args=(job, attempt), daemon=True).start()
+
+    def on_composed(self, job, attempt, executor, future, submitted_ns=None):
+        """Release the compose slot and complete the item, retrying it once if the pool broke under it."""
+        item, _, texture_id, _, _ = job
+        self.compose_slots.release()
+        if tracer.enabled and submitted_ns is not None:
+            # The compose itself runs in another process; record it from submit to completion
+            tracer.record("download.compose", "download", submitted_ns, time.perf_counter_ns(), {"asset": texture_id})
+        try:
+            future.result()
+        except BrokenProcessPool as e:
+            if attempt < 1:
+                # Queued or running when a worker died (possibly this job's own); try once more on its own
+                self.restart_compose_pool(executor)
+                self.resubmit_compose(job, attempt + 1)
+                return
+            self.show_error("Error", f"An error occurred while combining textures: {e}")
+        except Exception as e:
+            self.show_error("Error", f"An error occurred while combining textures: {e}")
+        self.finish_compose(texture_id)
+        self.finish_item(item)
+
+    def finish_item(self, item):
+        """Move a queue item to completed and start the next one, or wrap up the batch."""
+        with self.lock:
+            if item in self.in_progress:
+                self.in_progress.remove(item)
+            else:
+                print("[DEBUG] Item not found in in_progress for removal:", repr(item))
+            self.completed_downloads.append(item)
+            batch_finished = not self.download_queue and not self.in_progress
+            self.save_queue_state()
+
+        # Hand UI work back to the Tk thread
+        if batch_finished:
+            self.root.after(0, self.on_queue_finished)
+        else:
+            self.root.after(0, self.process_queue)
 
-            # Ensure the UI is updated
-            self.root.update_idletasks()
+    def on_queue_finished(self):
+        """Reset the batch state once every queued item has finished."""
+        self.currently_downloading = False
+        self.actual_progress = 100
+        self.progress_bar["value"] = 100
+        messagebox.showinfo("Queue", "All downloads completed.")
+        with self.lock:
+            self.completed_downloads = []
+            self.files_total = 0
+            self.files_done = 0
+        self.update_progress_label()
 
     def extract_files_with_md5(self, json_data):
         """Extract URLs and their MD5 hashes from the JSON response."""
@@ -370,7 +501,7 @@ class DownloadManager:
         if isinstance(json_data, dict):
             for key, value in json_data.items():
                 if key == "url" and "md5" in json_data:
-                    files_with_md5.append({"url": value, "md5": json_data["md5"]})
+                    files_with_md5.append({"url": value, "md5": json_data["md5"], "size": json_data.get("size")})
                 elif isinstance(value, dict) or isinstance(value, list):
                     files_with_md5.extend(self.extract_files_with_md5(value))
         elif isinstance(json_data, list):
@@ -6,8 +6,45 @@ import ctypes
 import platform
 import threading
 import queue
-import moderngl
 import os
+import hashlib
+
+from collections import OrderedDict
+
+try:
+    import moderngl
+except ImportError:
+    # Without moderngl the preview falls back to the CPU renderer
+    moderngl = None
+
+from modules.constants import RENDER_BACKEND, GPU_TEXTURE_CACHE_BYTES
+from modules.render_state import RenderState, STATE_UNIFORMS, prepare_texture_image
+from modules.cpu_renderer import CpuRenderer
+from modules.instrumentation import tracer
+
+class FrameStats:
+    """Accumulates per-stage frame costs (in nanoseconds) and reports their averages."""
+
+    def __init__(self):
+        self.totals = {}
+        self.frames = 0
+
+    def add(self, timings):
+        for stage, duration in timings.items():
+            self.totals[stage] = self.totals.get(stage, 0) + duration
+
+    def frame_done(self):
+        self.frames += 1
+
+    def report(self):
+        """Return average milliseconds per stage since the last report, and reset."""
+        if not self.frames:
+            return ""
+        report = " ".join(f"{stage} {total / self.frames / 1e6:.2f}ms" for stage, total in self.totals.items())
+        self.totals = {}
+        self.frames = 0
+        return report
+
 
 class OffscreenRenderer:
     """ModernGL offscreen renderer that doesn't require a window"""
@@ -16,11 +53,17 @@ class OffscreenRenderer:
         self.width = width
         self.height = height
         
+        if moderngl is None:
+            raise RuntimeError("moderngl is not installed")
+
         # Create standalone context (doesn't need a window)
         self.ctx = moderngl.create_context(standalone=True, require=330)
         
         # Initialize texture and shader state
         self.textures = [None, None]
+        # Uploaded textures by content key, least recently used first, within a VRAM budget
+        self.texture_cache = OrderedDict()
+        self.texture_cache_bytes = 0
         self.mix_ratio = 0.0
         self.rot = 0.0
         self.hue = 0.0
@@ -44,6 +87,8 @@ class OffscreenRenderer:
         self.fbo = self.ctx.framebuffer(
             color_attachments=[self.ctx.texture((width, height), 3)]
         )
+        self.pack_buffers = []
+        self.allocate_readback()
         self.set_shader()
     
     def init_resources(self):
@@ -162,14 +207,9 @@ class OffscreenRenderer:
         # Create index buffer
         self.ibo = self.ctx.buffer(indices)
         
-        # Create vertex array
-        self.vao = self.ctx.vertex_array(
-            self.prog,
-            [
-                (self.vbo, '3f 2f', 'position', 'texcoord')
-            ],
-            self.ibo
-        )
+        # Create vertex array and look up uniforms
+        self.vao = None
+        self.link_program()
         
         # Create empty textures
         for i in range(2):
@@ -177,42 +217,92 @@ class OffscreenRenderer:
             self.textures[i].filter = moderngl.LINEAR, moderngl.LINEAR
             self.textures[i].write(np.array([0, 0, 0], dtype='u1').tobytes())
         
-        # Set uniform locations
+    def link_program(self):
+        """
+        Bind the current program: sampler units, cached uniform handles and a vertex array.
+
+        Uniforms the shader does not declare (or the compiler optimized out) are simply
+        absent from the cache, so render() never has to probe for them.
+        """
         self.prog['textureSampler1'] = 0
         self.prog['textureSampler2'] = 1
+        self.uniforms = {
+            name: self.prog[name]
+            for name in list(STATE_UNIFORMS.values()) + ['time']
+            if name in self.prog
+        }
+
+        # Only shaders that actually read `time` need to be redrawn continuously
+        self.uses_time = 'time' in self.uniforms
+
+        # The vertex array is tied to a program; the texcoord attribute name varies between shaders
+        if self.vao is not None:
+            self.vao.release()
+        texcoord = next((name for name in ('texcoord', 'texCoord') if name in self.prog), None)
+        if texcoord:
+            content = (self.vbo, '3f 2f', 'position', texcoord)
+        else:
+            content = (self.vbo, '3f 2x4', 'position')
+        self.vao = self.ctx.vertex_array(self.prog, [content], self.ibo)
     
     def update_texture(self, image, texture_index=0):
-        """Updates one of the OpenGL textures with a new image."""
+        """Updates one of the OpenGL textures with a new image.
+
+        Images are keyed by their content, so showing an image that was uploaded
+        before (another slot, the previous texture) binds the cached texture
+        instead of converting and uploading it again.
+        """
         if texture_index not in [0, 1]:
             raise ValueError("texture_index must be 0 or 1")
-            
-        # Convert to RGB if needed
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Resize for performance if needed
-        max_size = 2048
-        if image.width > max_size or image.height > max_size:
-            # Calculate new size preserving aspect ratio
-            aspect = image.width / image.height
-            if image.width > image.height:
-                new_width = max_size
-                new_height = int(max_size / aspect)
-            else:
-                new_height = max_size
-                new_width = int(max_size * aspect)
-            image = image.resize((new_width, new_height))
-        
-        # Update the texture
-        if self.textures[texture_index]:
-            # Create new texture with correct size if needed
-            if self.textures[texture_index].size != image.size:
-                self.textures[texture_index].release()
-                self.textures[texture_index] = self.ctx.texture(image.size, 3)
-                self.textures[texture_index].filter = moderngl.LINEAR, moderngl.LINEAR
-            
-            # Write image data to texture
-            self.textures[texture_index].write(image.tobytes())
+
+        key = (image.mode, image.size, hashlib.blake2b(image.tobytes(), digest_size=16).digest())
+        texture = self.texture_cache.get(key)
+        if texture is not None:
+            self.texture_cache.move_to_end(key)
+        else:
+            texture = self.upload_texture(prepare_texture_image(image))
+            self.texture_cache[key] = texture
+            self.texture_cache_bytes += self.texture_bytes(texture)
+
+        previous = self.textures[texture_index]
+        self.textures[texture_index] = texture
+        if previous is not None and not self.is_cached(previous):
+            # The 1x1 placeholder from init_resources is not cached
+            previous.release()
+        self.evict_textures()
+
+    def is_cached(self, texture):
+        return any(texture is cached for cached in self.texture_cache.values())
+
+    def upload_texture(self, image):
+        """
+        Create a mipmapped GL texture from an RGB image.
+
+        Minified previews sample the mip chain to avoid aliasing. At preview size the
+        overlay lookup in default.frag stays on the base level, which CpuRenderer
+        samples; compare_renderers checks minified states against OpenGL only.
+        """
+        texture = self.ctx.texture(image.size, 3, image.tobytes())
+        texture.build_mipmaps()
+        texture.filter = moderngl.LINEAR_MIPMAP_LINEAR, moderngl.LINEAR
+        return texture
+
+    def texture_bytes(self, texture):
+        """Approximate VRAM use of an RGB texture with its mip chain (4/3 of the base level)."""
+        width, height = texture.size
+        return width * height * 3 * 4 // 3
+
+    def evict_textures(self):
+        """Release least recently used textures until the cache fits its budget; bound textures stay."""
+        for key in list(self.texture_cache):
+            if self.texture_cache_bytes <= GPU_TEXTURE_CACHE_BYTES:
+                break
+            texture = self.texture_cache[key]
+            if any(texture is bound for bound in self.textures):
+                continue
+            del self.texture_cache[key]
+            self.texture_cache_bytes -= self.texture_bytes(texture)
+            texture.release()
     
     def set_size(self, width, height):
         """Resize the offscreen framebuffer."""
@@ -232,6 +322,23 @@ class OffscreenRenderer:
         self.fbo = self.ctx.framebuffer(
             color_attachments=[self.ctx.texture((width, height), 3)]
         )
+        self.allocate_readback()
+
+    def allocate_readback(self):
+        """(Re)create the readback buffers for the current framebuffer size.
+
+        Frames are copied into one of two pixel pack buffers on the GPU and from
+        there into a single reused host buffer, so no per-frame bytes object is
+        allocated. While the shader animates, the copy of frame N is left to
+        complete while frame N+1 renders and frame N-1 is returned instead.
+        """
+        size = self.width * self.height * 3
+        for pack_buffer in self.pack_buffers:
+            pack_buffer.release()
+        self.pack_buffers = [self.ctx.buffer(reserve=size) for _ in range(2)]
+        self.pack_index = 0
+        self.pack_pending = False
+        self.readback = bytearray(size)
     
     def set_shader(self, vertex_source_or_file="default.vert", fragment_source_or_file="default.frag", is_file=True):
         print("set shader")
@@ -263,61 +370,65 @@ class OffscreenRenderer:
                     print(f"Error reading shader files: {e}")
                     return
             
-            # Release old program if it exists
-            if hasattr(self, 'prog') and self.prog:
-                self.prog.release()
-            
-            # Create new shader program
-            self.prog = self.ctx.program(
+            # Compile first so a broken shader leaves the current one in place
+            prog = self.ctx.program(
                 vertex_shader=vertex_source,
                 fragment_shader=fragment_source
             )
+
+            # Release old program if it exists
+            if hasattr(self, 'prog') and self.prog:
+                self.prog.release()
+            self.prog = prog
             
-            # Re-set uniform locations
-            self.prog['textureSampler1'] = 0
-            self.prog['textureSampler2'] = 1
+            # Re-set sampler units, uniform handles and the vertex array
+            self.link_program()
             
         except Exception as e:
             print(f"Error setting shader: {e}")
             import traceback
             traceback.print_exc()
     
-    def render(self):
-        """Render the scene and return the resulting image."""
+    def current_state(self):
+        """Snapshot of the renderer's own uniform attributes (used when no state is published)."""
+        return RenderState(self.mix_ratio, self.rot, self.hue, self.sat, self.val, self.hsvToggle)
+
+    def release(self):
+        """Free the GL objects owned by the renderer."""
+        for texture in self.textures:
+            if texture and not self.is_cached(texture):
+                texture.release()
+        for texture in self.texture_cache.values():
+            texture.release()
+        self.texture_cache.clear()
+        self.vao.release()
+        self.vbo.release()
+        self.ibo.release()
+        self.prog.release()
+        self.fbo.release()
+        for pack_buffer in self.pack_buffers:
+            pack_buffer.release()
+
+    def render(self, state=None):
+        """Render the scene for a RenderState (default: the renderer's attributes) and return the image."""
+        if state is None:
+            state = self.current_state()
+        else:
+            # Keep the attributes in step for code that still reads them
+            self.mix_ratio, self.rot, self.hue, self.sat, self.val, self.hsvToggle = state
+
         # Update time uniform for animations
         if not hasattr(self, "start_time") or self.start_time == 0:
             self.start_time = time.time()
         self.current_time = time.time() - self.start_time
         
-        # Set uniforms
-        try:
-            # These are the core uniforms we expect in every shader
-            self.prog['textureSampler1'] = 0
-            self.prog['textureSampler2'] = 1
-            
-            # These are optional and might not be in all shaders
-            try: self.prog['time'].value = self.current_time
-            except: pass
-            
-            try: self.prog['mixRatio'].value = self.mix_ratio
-            except: pass
-            
-            try: self.prog['rot'].value = self.rot
-            except: pass
-            
-            try: self.prog['hue'].value = self.hue
-            except: pass
-            
-            try: self.prog['sat'].value = self.sat
-            except: pass
-            
-            try: self.prog['val'].value = self.val
-            except: pass
-            
-            try: self.prog['hsvToggle'].value = self.hsvToggle
-            except: pass
-        except Exception as e:
-            print(f"Error setting uniforms during render: {e}")
+        # Set uniforms through the handles cached at link time
+        for field, name in STATE_UNIFORMS.items():
+            uniform = self.uniforms.get(name)
+            if uniform is not None:
+                uniform.value = getattr(state, field)
+        if self.uses_time:
+            self.uniforms['time'].value = self.current_time
         
         # Bind textures
         self.textures[0].use(location=0)
@@ -330,13 +441,29 @@ class OffscreenRenderer:
         self.ctx.clear(0.0, 0.0, 0.0, 1.0)
         
         # Render the quad
+        start = time.perf_counter_ns()
         self.vao.render()
-        
-        # Read the resulting pixels
-        pixels = self.fbo.read(components=3)
-        
-        # Convert to PIL Image
-        return Image.frombytes('RGB', (self.width, self.height), pixels, 'raw', 'RGB', 0, -1)
+        timings = {'draw': time.perf_counter_ns() - start}
+        
+        # Read the resulting pixels through the pixel pack buffers
+        start = time.perf_counter_ns()
+        pack_buffer = self.pack_buffers[self.pack_index]
+        self.fbo.read_into(pack_buffer, components=3)
+        if self.uses_time and self.pack_pending:
+            # Continuous mode: return the previous frame, whose copy has had a frame to finish
+            self.pack_buffers[1 - self.pack_index].read_into(self.readback)
+        else:
+            # On-demand frames are shown as soon as they are rendered
+            pack_buffer.read_into(self.readback)
+        self.pack_pending = self.uses_time
+        self.pack_index = 1 - self.pack_index
+        timings['readback'] = time.perf_counter_ns() - start
+        
+        # Convert to PIL Image (rows are flipped while decoding, without another copy)
+        start = time.perf_counter_ns()
+        image = Image.frombytes('RGB', (self.width, self.height), self.readback, 'raw', 'RGB', 0, -1)
+        timings['convert'] = time.perf_counter_ns() - start
+        return image, timings
 
 
 class ModernGLTkFrame(tk.Frame):
@@ -387,6 +514,16 @@ class ModernGLTkFrame(tk.Frame):
         self.last_frame_time = time.time()
         self.frame_scheduled = False
         self.target_fps = 24
+        self.frame_stats = FrameStats()
+
+        # Persistent canvas image, updated in place while the frame size stays the same
+        self.photo = None
+        self.canvas_image = None
+
+        # Frames are only rendered when something changed (or the shader animates);
+        # at most one frame is in flight and changes made meanwhile share the next one
+        self.dirty = True
+        self.frame_in_flight = False
         
         # Animation controls
         self.mix_ratio = 0.0
@@ -441,10 +578,10 @@ class ModernGLTkFrame(tk.Frame):
     
     def renderer_thread_func(self):
         """Function that runs in the renderer thread.
-        Creates a ModernGL context and processes render requests."""
+        Creates the renderer (ModernGL, or the CPU fallback) and processes render requests."""
         try:
             # Create the renderer
-            self.renderer = OffscreenRenderer(self.width, self.height)
+            self.renderer = self.create_renderer()
             
             # Mark as initialized
             self.gl_initialized = True
@@ -454,11 +591,12 @@ class ModernGLTkFrame(tk.Frame):
                 try:
                     # Get a command from the queue with a timeout
                     cmd, args, kwargs = self.render_queue.get(timeout=0.1)
+                    start_ns = time.perf_counter_ns()
                     
                     # Process the command
                     if cmd == 'render':
-                        # Render a frame
-                        result = self.renderer.render()
+                        # Render a frame from the published state snapshot
+                        result = self.renderer.render(*args)
                         self.result_queue.put(('render_result', result))
                     elif cmd == 'update_texture':
                         # Update a texture
@@ -470,13 +608,13 @@ class ModernGLTkFrame(tk.Frame):
                         self.result_queue.put(('resized', True))
                     elif cmd == 'set_uniform':
                         # Set a uniform value
+                        # Kept for scripts; the frame itself publishes RenderState snapshots with 'render'
                         name, value = args
                         setattr(self.renderer, name, value)
-                        self.result_queue.put(('uniform_set', True))
                     elif cmd == 'set_shader':
                         # Set custom shader
                         vertex_source_or_file, fragment_source_or_file, is_file = args
-                        self.set_shader(vertex_source_or_file, fragment_source_or_file, is_file)
+                        self.renderer.set_shader(vertex_source_or_file, fragment_source_or_file, is_file)
                         self.result_queue.put(('shader_set', True))
                     elif cmd == 'add_method':
                         # Add a method to the renderer dynamically
@@ -491,6 +629,8 @@ class ModernGLTkFrame(tk.Frame):
                     
                     # Mark task as done
                     self.render_queue.task_done()
+                    if tracer.enabled:
+                        tracer.record(f"renderer.{cmd}", "render", start_ns, time.perf_counter_ns())
                     
                 except queue.Empty:
                     # No commands in queue, continue
@@ -500,6 +640,9 @@ class ModernGLTkFrame(tk.Frame):
                     print(f"Error in renderer thread: {e}")
                     import traceback
                     traceback.print_exc()
+                    if cmd == 'render':
+                        # Unblock the UI, which waits for one result per requested frame
+                        self.result_queue.put(('render_result', (None, {})))
         
         except Exception as e:
             # Log initialization error
@@ -511,16 +654,24 @@ class ModernGLTkFrame(tk.Frame):
         if hasattr(self, 'renderer') and self.renderer:
             # Clean up OpenGL resources
             try:
-                for texture in self.renderer.textures:
-                    if texture:
-                        texture.release()
-                self.renderer.vao.release()
-                self.renderer.vbo.release()
-                self.renderer.ibo.release()
-                self.renderer.prog.release()
-                self.renderer.fbo.release()
+                self.renderer.release()
             except:
                 pass
+
+    def create_renderer(self):
+        """Create the renderer selected by RENDER_BACKEND.
+
+        "auto" uses OpenGL and falls back to the NumPy CpuRenderer when no OpenGL
+        3.3 context can be created (headless or GPU-less machines).
+        """
+        if RENDER_BACKEND != "cpu":
+            try:
+                return OffscreenRenderer(self.width, self.height)
+            except Exception as e:
+                if RENDER_BACKEND == "gl":
+                    raise
+                print(f"OpenGL renderer unavailable ({e}); using the CPU renderer")
+        return CpuRenderer(self.width, self.height)
     
     def update_fps_counter(self):
         """Update FPS counter and log the value."""
@@ -535,8 +686,8 @@ class ModernGLTkFrame(tk.Frame):
             # Calculate FPS
             self.fps = self.frame_count / elapsed
             
-            # Log FPS
-            print(f"FPS: {self.fps:.1f}")
+            # Log FPS with the average cost of each frame stage
+            print(f"FPS: {self.fps:.1f} | {self.frame_stats.report()}")
             
             # Reset counters
             self.frame_count = 0
@@ -552,12 +703,17 @@ class ModernGLTkFrame(tk.Frame):
         # Update renderer size
         if self.gl_initialized:
             self.render_queue.put(('resize', (width, height), {}))
+            self.request_redraw()
     
+    def request_redraw(self):
+        """Mark the preview as changed so the next frame tick renders it."""
+        self.dirty = True
+        self.redraw()
+
     def redraw(self):
-        """Request a new frame from the renderer and schedule the next redraw."""
-        # Don't render if splash is still active
+        """Schedule a frame, no sooner than the target frame rate allows."""
+        # Don't render if splash is still active; close_splash starts the first frame
         if self.splash_active:
-            self.after(100, self.redraw)
             return
         
         # Don't schedule if we're already waiting for a frame
@@ -593,34 +749,47 @@ class ModernGLTkFrame(tk.Frame):
         # Clear scheduling flag
         self.frame_scheduled = False
         
-        # Update last frame time
-        self.last_frame_time = time.time()
-        
-        # Update FPS counter
-        self.update_fps_counter()
-        
         # Check if we have a renderer
         if not self.gl_initialized:
             # Try again later
             self.after(100, self.redraw)
             return
+
+        # The frame in flight picks up pending changes when it lands (see poll_renderer)
+        if self.frame_in_flight:
+            return
+
+        # Nothing changed and nothing animates: stay idle until request_redraw
+        if not (self.dirty or self.is_animated()):
+            return
+        self.dirty = False
         
-        # Forward uniforms to renderer
-        self.render_queue.put(('set_uniform', ('mix_ratio', self.mix_ratio), {}))
-        self.render_queue.put(('set_uniform', ('rot', self.rot), {}))
-        self.render_queue.put(('set_uniform', ('hue', self.hue), {}))
-        self.render_queue.put(('set_uniform', ('sat', self.sat), {}))
-        self.render_queue.put(('set_uniform', ('val', self.val), {}))
-        self.render_queue.put(('set_uniform', ('hsvToggle', self.hsvToggle), {}))
+        # Update last frame time
+        self.last_frame_time = time.time()
         
-        # Request a new frame
-        self.render_queue.put(('render', (), {}))
+        # Update FPS counter
+        self.update_fps_counter()
         
-        # Process messages from the renderer
-        self.process_renderer_messages()
+        # Request a new frame with one snapshot of the latest values; intermediate
+        # slider positions since the last frame are never sent
+        state = RenderState(self.mix_ratio, self.rot, self.hue, self.sat, self.val, self.hsvToggle)
+        self.render_queue.put(('render', (state,), {}))
+        self.frame_in_flight = True
         
-        # Schedule next frame
-        self.after(1, self.redraw)
+        # Wait for the frame without blocking the event loop
+        self.poll_renderer()
+
+    def is_animated(self):
+        """True while the active shader reads the time uniform and needs continuous frames."""
+        return bool(self.renderer is not None and getattr(self.renderer, 'uses_time', False))
+
+    def poll_renderer(self):
+        """Drain renderer messages until the requested frame arrives, then schedule the next one if needed."""
+        self.process_renderer_messages()
+        if self.frame_in_flight:
+            self.after(2, self.poll_renderer)
+        elif self.dirty or self.is_animated():
+            self.redraw()
     
     def process_renderer_messages(self):
         """Process any messages from the renderer thread."""
@@ -631,7 +800,11 @@ class ModernGLTkFrame(tk.Frame):
                 
                 if msg_type == 'render_result':
                     # Display the rendered image
-                    self.display_image(data)
+                    self.frame_in_flight = False
+                    image, timings = data
+                    self.frame_stats.add(timings)
+                    self.display_image(image)
+                    self.frame_stats.frame_done()
                 
                 # Mark as processed
                 self.result_queue.task_done()
@@ -643,17 +816,20 @@ class ModernGLTkFrame(tk.Frame):
         if not image:
             return
             
-        # Convert to PhotoImage
-        photo = ImageTk.PhotoImage(image)
-        
-        # Clear canvas
-        self.canvas.delete("all")
-        
-        # Create new image on canvas
-        self.canvas.create_image(0, 0, image=photo, anchor=tk.NW)
-        
-        # Keep a reference to prevent garbage collection
-        self.canvas.photo = photo
+        start = time.perf_counter_ns()
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == image.size:
+            # Same size: update the existing PhotoImage in place
+            self.photo.paste(image)
+        else:
+            self.photo = ImageTk.PhotoImage(image)
+            if self.canvas_image is None:
+                self.canvas_image = self.canvas.create_image(0, 0, image=self.photo, anchor=tk.NW)
+            else:
+                self.canvas.itemconfig(self.canvas_image, image=self.photo)
+            
+            # Keep a reference to prevent garbage collection
+            self.canvas.photo = self.photo
+        self.frame_stats.add({'present': time.perf_counter_ns() - start})
     
     def GL_update_texture(self, image, texture_index=0):
         """Updates one of the textures with a new image."""
@@ -664,11 +840,8 @@ class ModernGLTkFrame(tk.Frame):
             
         if texture_index not in [0, 1]:
             raise ValueError("texture_index must be 0 or 1")
-            
-        # Convert to RGB if needed
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
         
+        # Conversion to RGB happens on the renderer thread, and only for images it has not seen
         # Set image dimensions
         if texture_index == 0:
             self.image_width, self.image_height = image.size
@@ -676,6 +849,7 @@ class ModernGLTkFrame(tk.Frame):
         
         # Forward to renderer thread
         self.render_queue.put(('update_texture', (image, texture_index), {}))
+        self.request_redraw()
     
     def resize_to_image(self):
         """Resize the frame to match the image dimensions."""
@@ -690,6 +864,7 @@ class ModernGLTkFrame(tk.Frame):
             # Update renderer size
             if self.gl_initialized:
                 self.render_queue.put(('resize', (self.width, self.height), {}))
+                self.request_redraw()
             
             # Force the parent container to adapt to the new size
             self.update_idletasks()
@@ -699,22 +874,27 @@ class ModernGLTkFrame(tk.Frame):
         if ratio < -1.0 or ratio > 1.0:
             raise ValueError("Mix ratio must be between -1.0 and 1.0")
         self.mix_ratio = ratio
+        self.request_redraw()
     
     def set_rotation(self, rotation):
         """Set the rotation value for the second texture."""
         self.rot = rotation
+        self.request_redraw()
     
     def set_hue(self, hue):
         """Set the hue adjustment value."""
         self.hue = hue
+        self.request_redraw()
     
     def set_saturation(self, saturation):
         """Set the saturation adjustment value."""
         self.sat = saturation
+        self.request_redraw()
     
     def set_value(self, value):
         """Set the value/brightness adjustment value."""
         self.val = value
+        self.request_redraw()
     
     def hsv_click(self, event=None):
         """Toggle HSV adjustment on/off."""
@@ -722,6 +902,7 @@ class ModernGLTkFrame(tk.Frame):
             self.hsvToggle = 0.0
         else:
             self.hsvToggle = 1.0
+        self.request_redraw()
     
     def set_shader(self, vertex_source_or_file="default.vert", fragment_source_or_file="default.frag", is_file=True):
         """Set custom shader code to be used for rendering.
@@ -732,8 +913,7 @@ class ModernGLTkFrame(tk.Frame):
             is_file: If True, parameters are treated as filenames to load
         """
         # Store the last shader request to avoid duplicate scheduling
-        vertex_source_or_file = f"assets/shaders/{vertex_source_or_file}"
-        fragment_source_or_file = f"assets/shaders/{fragment_source_or_file}"
+        # (the renderer resolves the names under assets/shaders/)
         self._last_shader_request = (vertex_source_or_file, fragment_source_or_file, is_file)
         
         if not self.gl_initialized:
@@ -751,6 +931,7 @@ class ModernGLTkFrame(tk.Frame):
         # Create command to set shader
         self.render_queue.put(('set_shader', 
                             (vertex_source_or_file, fragment_source_or_file, is_file), {}))
+        self.request_redraw()
     
     def set_target_fps(self, fps):
         """Set the target frame rate."""
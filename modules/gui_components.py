@@ -7,20 +7,25 @@ import numpy as np
 import time
 
 
+from collections import OrderedDict
 from tkinter import Label, Entry, Button, Listbox, END, Frame, ttk, font, messagebox
 from PIL import Image, ImageTk
 
 
 import modules.api_operations as api_ops
 
-from modules.constants import TARGET_FOLDER, OVERLAY_FOLDER, FILE_CONFIG
+from modules.constants import TARGET_FOLDER, OVERLAY_FOLDER, FILE_CONFIG, DISPLAY_IMAGE_HEIGHT, THUMBNAIL_REFRESH_DELAY_MS, THUMBNAIL_PHOTO_ENTRIES
 from modules.api_operations import fetch_api_data
-from modules.thumbnail_operations import fetch_thumbnail
+from modules.thumbnail_service import ThumbnailService, matching_assets
+from modules.thumbnail_operations import fetch_thumbnail_variant
 from modules.utility_functions import translate_texture_path, center_window, get_key_by_name
 from modules.database_operations import save_database
 from modules.glClass import ModernGLTkFrame
 from modules.texture_operations import TextureOperations
 from modules.download_manager import DownloadManager
+from modules.name_index import PrefixIndex
+from modules.display_cache import DisplayImageCache
+from modules.instrumentation import traced
 
 
 
@@ -32,13 +37,76 @@ except AttributeError:
     scale_factor = 1  # Default if unsupported
 
 
+class ThumbnailCell:
+    """One cell of the thumbnail grid, reconfigured in place for whichever asset it shows."""
+
+    def __init__(self, parent, column, blank_image, on_click):
+        self.texture_id = None
+        self.blank_image = blank_image
+
+        # Create a fixed-size container for thumbnail and tags
+        self.container = Frame(
+            parent,
+            borderwidth=2,
+            relief="solid",
+            highlightbackground="gray",
+            highlightthickness=2,
+            bg="black"
+        )
+        self.container.grid(row=0, column=column, padx=10, pady=5, sticky="N")
+        self.container.grid_propagate(False)  # Prevent resizing
+
+        # The blank image keeps the label sized in pixels until the thumbnail arrives
+        self.image_label = Label(self.container, image=blank_image, width=400, height=400, bg="black")
+        self.image_label.image = blank_image
+        self.image_label.pack(pady=5)
+
+        # Display texture tags
+        self.tags_label = Label(
+            self.container,
+            wraplength=250,  # Ensure text wraps within the container
+            font=("Arial", int(8)),
+            justify="center",
+            height=4
+        )
+        self.tags_label.pack(pady=5)
+
+        # Bind click event to the entire container
+        for widget in (self.container, self.image_label, self.tags_label):
+            widget.bind("<Button-1>", lambda event: on_click(self))
+        self.container.grid_remove()
+
+    def show(self, texture_id, tags, selected, photo=None):
+        self.texture_id = texture_id
+        self.set_image(photo)
+        self.tags_label.config(text=", ".join(tags))
+        self.set_selected(selected)
+        self.container.grid()
+
+    def set_image(self, photo):
+        photo = photo or self.blank_image
+        self.image_label.config(image=photo)
+        self.image_label.image = photo  # Keep reference to prevent garbage collection
+
+    def set_selected(self, selected):
+        self.container.config(highlightbackground="blue" if selected else "gray", highlightthickness=2)
+
+    def hide(self):
+        self.texture_id = None
+        self.container.grid_remove()
+
+
 class TextureTagger:
     def __init__(self, root, db):
         locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
         self.root = root
         self.root.title("Morrowind PBR Texture Project")
         self.db = db
-        self.all_assets = api_ops.fetch_api_data("https://api.polyhaven.com/assets?type=textures")
+        # A stale catalog is shown immediately and swapped on the Tk thread once revalidated
+        self.all_assets = api_ops.fetch_api_data(
+            "https://api.polyhaven.com/assets?type=textures",
+            on_refresh=lambda assets: self.root.after(0, lambda: self.refresh_all_assets(assets)),
+        )
 
         self.selected_slot = None
 
@@ -50,6 +118,10 @@ class TextureTagger:
         self.filtered_texture_paths = self.texture_paths
         self.filtered_texture_names = [os.path.basename(texture_path).replace("textures\\", "") for texture_path in self.filtered_texture_paths]
         self.filtered_texture_names_set = set(self.filtered_texture_names)
+        self.texture_name_index = PrefixIndex(sorted(self.filtered_texture_names_set))
+        self.texture_path_index = PrefixIndex(self.texture_paths, key=lambda path: os.path.basename(path).casefold())
+        self.filtered_path_index = None
+        self.filtered_path_index_source = None
         self.root.bind("<Button-1>", self.global_click_handler)
         self.current_index = self.get_current_index()
         self.current_selection = None
@@ -58,6 +130,15 @@ class TextureTagger:
         self.thumbnail_data_cache = {}
         self.thumbnail_cache_size = 20
         self.current_thumbnail_index = 0
+        # Thumbnails are fetched and scaled off the Tk thread; stale deliveries are dropped by generation
+        self.thumbnail_service = ThumbnailService(root)
+        self.thumbnail_generation = 0
+        self.thumbnail_refresh_id = None
+        # PhotoImages ready for the grid, by asset id
+        self.thumbnail_photos = OrderedDict()
+        # Display images load on worker threads; loads for textures already navigated past are cancelled
+        self.display_generation = 0
+        self.display_futures = []
         self.root.configure(bg="#999999")
         base_width, base_height = 1600, 960
         scaled_width = int(base_width * scale_factor)
@@ -129,6 +210,8 @@ class TextureTagger:
         self.progress_bar.grid(row=2, columnspan=3, pady=5)
 
         self.texture_operations = TextureOperations(db, self.all_assets)
+        # Decoded, display-sized base textures and overlays, prefetched for the neighbouring textures
+        self.display_cache = DisplayImageCache(self.load_display_image)
         self.download_manager = DownloadManager(db, root, self.progress_bar, self.progress_label, self.all_assets)
 
 
@@ -257,6 +340,14 @@ class TextureTagger:
         self.thumbnail_frame = Frame(self.gridB, width=int(455), height=int(555), bg="black")
         self.thumbnail_frame.pack(pady=10)
         self.thumbnail_frame.pack_propagate(False)
+        # A fixed pool of cells is reconfigured on every page instead of rebuilt
+        self.blank_thumbnail = tk.PhotoImage(width=1, height=1)
+        self.thumbnail_cells = [
+            ThumbnailCell(self.thumbnail_frame, col, self.blank_thumbnail, self.on_thumbnail_click) for col in range(5)
+        ]
+        self.no_results_label = Label(self.thumbnail_frame, text="No matching thumbnails found.", font=("Arial", int(12 * scale_factor)))
+        self.no_results_label.grid(row=1, column=0, columnspan=5, pady=10)
+        self.no_results_label.grid_remove()
         # Add togglable buttons with labels
         self.button_info = {
             "tx_a_": "armor",
@@ -374,6 +465,16 @@ class TextureTagger:
         self.next_thumbnails_button = Button(thumb_button_frame, font=7, text="Next Thumbnails", command=self.next_thumbnails)
         self.next_thumbnails_button.grid(row=0, column=2, padx=10)
     
+    def refresh_all_assets(self, assets):
+        """
+        Swap in a revalidated asset catalog. Runs on the Tk thread; the old dict is
+        never modified, so download threads still iterating it are unaffected.
+        """
+        self.all_assets = assets
+        self.texture_operations.all_assets = assets
+        self.download_manager.all_assets = assets
+        self.download_manager.texture_operations.all_assets = assets
+
     def update_rotation(self, event):
         """Update rotation with snap to 90-degree increments"""
         value = int(float(event))
@@ -649,7 +750,15 @@ class TextureTagger:
 
     def autocomplete(self, entered_text):
         """Filters the texture list based on the entered text"""
-        return [name for name in self.filtered_texture_names_set if name.startswith(entered_text)]
+        return self.texture_name_index.matches(entered_text)
+
+    def get_filtered_path_index(self):
+        """Return a basename prefix index over filtered_texture_paths, rebuilt when the list changes."""
+        # filtered_texture_paths is always reassigned, never mutated, so identity tells us when to rebuild
+        if self.filtered_path_index_source is not self.filtered_texture_paths:
+            self.filtered_path_index = PrefixIndex(self.filtered_texture_paths, key=os.path.basename)
+            self.filtered_path_index_source = self.filtered_texture_paths
+        return self.filtered_path_index
 
     def show_entry(self, event):
         """Show the entry box and autocomplete list."""
@@ -888,6 +997,7 @@ class TextureTagger:
             self.label_frames[f"{key}_untagged"] = Label(frame, font=5, text="0", fg="red")
             self.label_frames[f"{key}_untagged"].pack(side="left")
             
+    @traced(category="ui")
     def update_counts(self):
 
         if self.use_file_config:
@@ -1033,34 +1143,20 @@ class TextureTagger:
             slot_index = ord(self.selected_slot) - ord('A')
             if 0 <= slot_index < len(selected_thumbnails):
                 thumbnail_name = selected_thumbnails[slot_index]
-                thumbnail_name = get_key_by_name(self.all_assets, thumbnail_name)
-                normalized_name = thumbnail_name.lower().replace(" ", "_")
-                thumbnail_path = f"thumbnails\\{normalized_name}.png"
-                #print(f"Slot: {self.selected_slot}, Thumbnail path: {thumbnail_path}")
-
-                # Load and display the thumbnail
-                if os.path.exists(thumbnail_path):
-                    try:
-                        image = Image.open(thumbnail_path)
-
-                        # Get current dimensions
-                        width, height = image.size
-
-                        # Scale by 1.5x
-                        new_width = int(width * 1.5)
-                        new_height = int(height * 1.5)
-
-                        # Resize the image
-                        image_resized = image.resize((new_width, new_height), Image.Resampling.LANCZOS)  # Resizes with high-quality filtering
-                        
+                asset_id = get_key_by_name(self.all_assets, thumbnail_name)
+                thumbnail_url = self.all_assets.get(asset_id, {}).get("thumbnail_url") if asset_id else None
 
+                # Load and display the stored preview-size thumbnail; never downloads on the Tk thread
+                try:
+                    image_resized = fetch_thumbnail_variant(thumbnail_url, "preview", download=False) if thumbnail_url else None
+                    if image_resized is not None:
                         thumb_photo = ImageTk.PhotoImage(image_resized)
                         self.preview_label.config(image=thumb_photo, text="")
                         self.preview_label.image = thumb_photo  # Prevent garbage collection
-                    except Exception as e:
-                        print(f"Error opening : {e}")
-                else:
-                    print(f"Thumbnail path not found: {thumbnail_path}")
+                    else:
+                        print(f"Thumbnail not found: {thumbnail_name}")
+                except Exception as e:
+                    print(f"Error opening : {e}")
             else:
                 print(f"No thumbnail for slot {self.selected_slot}")
         else:
@@ -1073,14 +1169,19 @@ class TextureTagger:
         self.selected_thumbnails_label.config(text=f"Selected Thumbnails: {count}")
 
 
+    @traced(category="ui")
     def display_thumbnails(self):
         """Display selectable thumbnails of textures from Polyhaven."""
         #start_time = time.time()
         #print("Starting display_thumbnails...")
 
-        # Clear previous thumbnails
-        for widget in self.thumbnail_frame.winfo_children():
-            widget.destroy()
+        # An explicit refresh supersedes one scheduled by display_texture
+        if self.thumbnail_refresh_id is not None:
+            self.root.after_cancel(self.thumbnail_refresh_id)
+            self.thumbnail_refresh_id = None
+
+        # Thumbnails still in flight for the previous page are dropped on delivery
+        self.thumbnail_generation += 1
         #print(f"Time to clear thumbnails: {time.time() - start_time:.4f} seconds")
 
         # Get matching textures for the current texture
@@ -1093,97 +1194,75 @@ class TextureTagger:
         #print(json.dumps(matching_textures, indent=4))
 
         if not paginated_textures:
-            no_results_label = Label(self.thumbnail_frame, text="No matching thumbnails found.", font=("Arial", int(12 * scale_factor)))
-            no_results_label.pack(pady=10)
+            for cell in self.thumbnail_cells:
+                cell.hide()
+            self.no_results_label.grid()
             self.update_selected_thumbnails_count()
             return
+        self.no_results_label.grid_remove()
 
-        # Display thumbnails and tags for each matching texture
-        for col, texture in enumerate(paginated_textures):
-            thumbnail_url = texture.get("thumbnail_url")
+        # Highlight state is the same for every cell
+        texture_path = self.filtered_texture_paths[self.current_index]
+        #selected_thumbnails = self.db["textures"].get(texture_path, {}).get("selected_thumbnails", [])
+        selected_thumbnails = [
+            thumb["name"] if isinstance(thumb, dict) else thumb
+            for thumb in self.db["textures"].get(texture_path, {}).get("selected_thumbnails", [])
+        ]
+
+        # Cells show their tags at once; images not already cached arrive from the thumbnail service
+        for col, cell in enumerate(self.thumbnail_cells):
+            if col >= len(paginated_textures):
+                cell.hide()
+                continue
+            texture = paginated_textures[col]
             texture_id = texture.get("name")  # Unique ID for the texture
-            
-            texture_tags = texture.get("tags", [])
+            photo = self.thumbnail_photos.get(texture_id)
+            if photo is not None:
+                self.thumbnail_photos.move_to_end(texture_id)
+            cell.show(texture_id, texture.get("tags", []), texture_id in selected_thumbnails, photo)
 
-            if thumbnail_url:
-                try:
-                    # Fetch the thumbnail (use caching)
-                    thumb_img = fetch_thumbnail(thumbnail_url)
-                    if thumb_img:
-                        thumb_img.thumbnail((512, 512))  # Adjust thumbnail size for display
-
-                        # Get current dimensions
-                        width, height = thumb_img.size
-
-                        # Scale by 1.5x
-                        new_width = int(width * 1.5)
-                        new_height = int(height * 1.5)
-
-                        # Resize the image
-                        thumb_resized = thumb_img.resize((new_width, new_height), Image.Resampling.LANCZOS)  # Resizes with high-quality filtering
-
-                        thumb_photo = ImageTk.PhotoImage(thumb_resized)
-
-                        # Create a fixed-size container for thumbnail and tags
-                        thumb_container = Frame(
-                            self.thumbnail_frame,
-                            borderwidth=2,
-                            relief="solid",
-                            highlightbackground="gray",
-                            highlightthickness=2,
-                            bg="black"
-                        )
-                        
-                        thumb_container.grid(row=0, column=col, padx=10, pady=5, sticky="N")
-                        thumb_container.grid_propagate(False)  # Prevent resizing
-
-                        # Display the thumbnail image
-                        thumb_label = Label(thumb_container, image=thumb_photo, width=400, height=400, bg="black")
-                        thumb_label.image = thumb_photo  # Keep reference to prevent garbage collection
-                        thumb_label.pack(pady=5)
-                      
-
-                        # Display texture tags
-                        tags_label = Label(
-                            thumb_container,
-                            text=", ".join(texture_tags),
-                            wraplength=250,  # Ensure text wraps within the container
-                            font=("Arial", int(8)),
-                            justify="center",
-                            height=4
-                        )
-                        thumb_label.pack(fill=None, expand=False)
-                        tags_label.pack(pady=5)
-
-                        # Handle click to select/unselect thumbnail
-                        def on_click(event=None, texture_id=texture_id, container=thumb_container):
-                            self.toggle_selection(texture_id, container)
-                            self.update_selected_thumbnails_count()
-
-                        # Bind click event to the entire container
-                        thumb_container.bind("<Button-1>", on_click)
-                        thumb_label.bind("<Button-1>", on_click)
-                        tags_label.bind("<Button-1>", on_click)
-
-                        # Highlight if already selected
-                        texture_path = self.filtered_texture_paths[self.current_index]
-                        #selected_thumbnails = self.db["textures"].get(texture_path, {}).get("selected_thumbnails", [])
-                        selected_thumbnails = [
-                            thumb["name"] if isinstance(thumb, dict) else thumb
-                            for thumb in self.db["textures"].get(texture_path, {}).get("selected_thumbnails", [])
-                        ]
-                        #print(f"Current Texture Path: {texture_path}")
-                        #print(f"Selected Thumbnails: {selected_thumbnails}")
-                        #print(f"Checking Texture ID: {texture_id}")
-                        if texture_id in selected_thumbnails:
-                            thumb_container.config(highlightbackground="blue", highlightthickness=2)
+            thumbnail_url = texture.get("thumbnail_url")
+            if photo is None and thumbnail_url:
+                self.thumbnail_service.request(
+                    thumbnail_url,
+                    lambda thumb_resized, cell=cell, texture=texture, generation=self.thumbnail_generation:
+                        self.set_thumbnail_image(generation, cell, texture, thumb_resized),
+                )
+
+        # Warm the cache for the next page, and for the next texture's first page; scanning
+        # the catalog for the next texture's matches happens on the service's workers
+        self.thumbnail_service.prefetch(texture.get("thumbnail_url") for texture in matching_textures[end_index:end_index + 5])
+        if self.current_index + 1 < len(self.filtered_texture_paths) and self.all_assets:
+            next_path = self.filtered_texture_paths[self.current_index + 1]
+            next_entry = self.db["textures"].get(next_path.lower()) or self.db["textures"].get(next_path, {})
+            if next_entry.get("tags"):
+                self.thumbnail_service.prefetch_matching(self.all_assets, list(next_entry["tags"]), 5)
 
-                except Exception as e:
-                    print(f"Error loading thumbnail from {thumbnail_url}: {e}")
         # Update the selected thumbnails count
         self.update_selected_thumbnails_count()
 
-    def toggle_selection(self, texture_id, container):
+    def set_thumbnail_image(self, generation, cell, texture, thumb_resized):
+        """Put a delivered thumbnail into its cell, unless the page changed meanwhile."""
+        if generation != self.thumbnail_generation:
+            return
+        if thumb_resized is None:
+            print(f"Error loading thumbnail from {texture.get('thumbnail_url')}")
+            return
+
+        thumb_photo = ImageTk.PhotoImage(thumb_resized)
+        self.thumbnail_photos[texture.get("name")] = thumb_photo
+        while len(self.thumbnail_photos) > THUMBNAIL_PHOTO_ENTRIES:
+            self.thumbnail_photos.popitem(last=False)
+        cell.set_image(thumb_photo)
+
+    def on_thumbnail_click(self, cell):
+        """Handle click to select/unselect thumbnail."""
+        if cell.texture_id is None:
+            return
+        self.toggle_selection(cell.texture_id, cell)
+        self.update_selected_thumbnails_count()
+
+    def toggle_selection(self, texture_id, cell):
         """Toggle selection of a thumbnail for the current texture and update the database."""
         # Get the current texture path
         texture_path = self.filtered_texture_paths[self.current_index]
@@ -1198,11 +1277,11 @@ class TextureTagger:
         if is_selected:
             # Deselect: Remove the dictionary with the matching "name"
             selected_thumbnails[:] = [item for item in selected_thumbnails if item["name"] != texture_id]
-            container.config(highlightbackground="gray", highlightthickness=2)
+            cell.set_selected(False)
         else:
             # Select: Add a new dictionary with the "name" key
             selected_thumbnails.append({"name": texture_id})
-            container.config(highlightbackground="blue", highlightthickness=2)
+            cell.set_selected(True)
 
         # Save changes to the database
         save_database(self.db)
@@ -1257,20 +1336,19 @@ class TextureTagger:
         self.gl_frame.set_saturation(saturation)
         self.gl_frame.set_value(value)
             
+    @traced(category="ui")
     def display_texture(self, entered_texture_name = None, manipulated_overlay_image=None):
         """Update the texture based on the user input."""
         texture_path = None
 
         # Determine the texture path based on the user input or the current index
         if entered_texture_name is not None:
-            for path in self.filtered_texture_paths:
-                if os.path.basename(path).startswith(entered_texture_name):
-                    texture_path = path
-                    break
+            texture_path = self.get_filtered_path_index().first(entered_texture_name)
             if texture_path is None:
                 print(f"Texture not found: {entered_texture_name}")
                 self.texture_name_label.config(text="Texture: Not Found")
                 self.image_label.config(image=None)  # Clear image
+                self.start_display_generation()
                 return
         else:
             #print(f"Filtered paths count: {len(self.filtered_texture_paths)}")
@@ -1307,74 +1385,28 @@ class TextureTagger:
         else:
             slot_index = None  # No valid index
 
-        # Load the zoom image (used as the base image)
-        zoom_image = self.texture_operations.load_image(texture_path.lower())
-        if zoom_image is None:
-            print(f"Failed to load zoom image: \n\n\n\n{texture_path}\n\n\n\n")
-            return
-
-        # Set default image
-        image = zoom_image
-        self.current_zoom_image = zoom_image
+        # The base image and overlay are decoded and resized on worker threads and shown as
+        # each arrives; prefetched images are shown immediately
+        generation = self.start_display_generation()
+        self.when_loaded(self.load_display_async(texture_path.lower()),
+                         lambda image: self.show_base_image(generation, texture_path, image))
 
         # Validate slot_index before accessing selected_thumbnails
         if slot_index is not None and 0 <= slot_index < len(selected_thumbnails):
             #print("SLOT:", slot_index)
-            thumbnail_name = selected_thumbnails[slot_index]
-            thumbnail_name = get_key_by_name(self.all_assets, thumbnail_name)
-            diff_overlay_path = os.path.join(OVERLAY_FOLDER, f"{thumbnail_name}_overlay.png")
-            col_overlay_path = os.path.join(OVERLAY_FOLDER, f"{thumbnail_name}_overlay.png")
-            print(diff_overlay_path)
-            print(col_overlay_path)
-
-            # Check for existence of overlay images
-            overlay_path = None
-            if os.path.exists(diff_overlay_path):
-                overlay_path = diff_overlay_path
-            elif os.path.exists(col_overlay_path):
-                overlay_path = col_overlay_path
+            overlay_path = self.overlay_path_for(selected_thumbnails[slot_index])
             if overlay_path is None:
-                print(f"No overlay match found for: {thumbnail_name}")
+                print(f"No overlay match found for: {selected_thumbnails[slot_index]}")
         else:
             overlay_path = None
 
-        display_image = self.prepare_display_image(image)
-    
-        self.d_width, self.d_height = display_image.size
-        
-        self.label_frame.config(width=self.d_width, height=self.d_height)
-        self.label_frame.pack_propagate(False)  # This prevents the frame from resizing to fit contents
-        self.label_frame.pack()
-        self.image_label.config(width=self.d_width, height=self.d_height)
-        self.image_label.pack_propagate(False)  # This prevents the label from resizing to fit contents
-        self.image_label.pack()
-
-        self.gl_frame.set_initial_size(self.d_width, self.d_height)
-
-
-        def check_init():
-            if self.gl_frame.gl_initialized:
-                print("GL init completed")
-            else:
-                self.root.after(100, check_init)
-            
-        check_init()
-
-        
-        self.gl_frame.GL_update_texture(display_image)
-
+        # The previous overlay stays hidden until this texture's overlay is ready
+        self.gl_frame.set_mix_ratio(0.0)
         if overlay_path:
-            overlay_image = self.texture_operations.load_image(overlay_path)
-            if overlay_image is not None:
-                overlay_image = self.prepare_display_image(overlay_image)
-                self.overlay_image = overlay_image
-                self.gl_frame.GL_update_texture(overlay_image, 1)
-                self.gl_frame.set_mix_ratio(0.5)
-            else:
-                print(f"Failed to load overlay image: {overlay_path}")
-                self.gl_frame.set_mix_ratio(0.0)
-        else:
-            self.gl_frame.set_mix_ratio(0.0)
+            self.when_loaded(self.load_display_async(overlay_path),
+                             lambda image: self.show_overlay_image(generation, overlay_path, image))
+
+        self.display_futures += self.prefetch_display_images(selected_thumbnails)
 
         # Check if selected_thumbnail has HSVR settings in the database
         if selected_thumbnails:
@@ -1426,14 +1458,105 @@ class TextureTagger:
         for tag in stored_tags:
             self.tags_listbox.insert(END, tag)
 
-        # Display thumbnails of related textures
-        self.display_thumbnails()
+        # Display thumbnails of related textures once navigation settles
+        self.thumbnail_refresh_id = self.root.after(THUMBNAIL_REFRESH_DELAY_MS, self.display_thumbnails)
+
+    def start_display_generation(self):
+        """Start a new navigation: cancel queued loads and the pending thumbnail refresh of the previous one."""
+        self.display_generation += 1
+        for future in self.display_futures:
+            future.cancel()
+        self.display_futures = []
+        if self.thumbnail_refresh_id is not None:
+            self.root.after_cancel(self.thumbnail_refresh_id)
+            self.thumbnail_refresh_id = None
+        return self.display_generation
+
+    def load_display_async(self, path):
+        """Queue a display image load owned by the current navigation."""
+        future = self.display_cache.load_async(path)
+        self.display_futures.append(future)
+        return future
+
+    def when_loaded(self, future, callback):
+        """Call callback(image) on the Tk thread when future completes; right away if it already has."""
+        if future.done():
+            callback(None if future.cancelled() else future.result())
+            return
+        future.add_done_callback(
+            lambda done: self.root.after(0, lambda: callback(None if done.cancelled() else done.result()))
+        )
 
-    
+    def show_base_image(self, generation, texture_path, display_image):
+        """Size the preview to a loaded base texture and upload it, unless navigation has moved on."""
+        if generation != self.display_generation:
+            return
+        if display_image is None:
+            print(f"Failed to load zoom image: \n\n\n\n{texture_path}\n\n\n\n")
+            return
+
+        self.d_width, self.d_height = display_image.size
+
+        self.label_frame.config(width=self.d_width, height=self.d_height)
+        self.label_frame.pack_propagate(False)  # This prevents the frame from resizing to fit contents
+        self.label_frame.pack()
+        self.image_label.config(width=self.d_width, height=self.d_height)
+        self.image_label.pack_propagate(False)  # This prevents the label from resizing to fit contents
+        self.image_label.pack()
+
+        self.gl_frame.set_initial_size(self.d_width, self.d_height)
+
+
+        def check_init():
+            if self.gl_frame.gl_initialized:
+                print("GL init completed")
+            else:
+                self.root.after(100, check_init)
+            
+        check_init()
+
+        self.gl_frame.GL_update_texture(display_image)
+
+    def show_overlay_image(self, generation, overlay_path, overlay_image):
+        """Upload a loaded overlay and blend it in, unless navigation has moved on."""
+        if generation != self.display_generation:
+            return
+        if overlay_image is None:
+            print(f"Failed to load overlay image: {overlay_path}")
+            return
+        self.overlay_image = overlay_image
+        self.gl_frame.GL_update_texture(overlay_image, 1)
+        self.gl_frame.set_mix_ratio(0.5)
+
+
+    def overlay_path_for(self, thumbnail_name):
+        """Return the staged overlay path of a selected thumbnail's asset, or None if there is none."""
+        asset_id = get_key_by_name(self.all_assets, thumbnail_name)
+        overlay_path = os.path.join(OVERLAY_FOLDER, f"{asset_id}_overlay.png")
+        return overlay_path if os.path.exists(overlay_path) else None
+
+    def prefetch_display_images(self, selected_thumbnails):
+        """Decode the overlays of the other slots and the previous/next textures in the background; returns the futures."""
+        paths = [self.overlay_path_for(thumbnail_name) for thumbnail_name in selected_thumbnails]
+        for index in (self.current_index + 1, self.current_index - 1):
+            if 0 <= index < len(self.filtered_texture_paths):
+                texture_path = self.filtered_texture_paths[index].lower()
+                paths.append(texture_path)
+                neighbour_thumbnails = self.db["textures"].get(texture_path, {}).get("selected_thumbnails", [])
+                if neighbour_thumbnails:
+                    first = neighbour_thumbnails[0]
+                    paths.append(self.overlay_path_for(first["name"] if isinstance(first, dict) else first))
+        return self.display_cache.prefetch([path for path in paths if path])
+
+    def load_display_image(self, path, height):
+        """Decode an image and resize it for display; runs on the display cache's prefetch thread too."""
+        image = self.texture_operations.load_image(path)
+        if image is None:
+            return None
+        return self.prepare_display_image(image, height)
 
-    def prepare_display_image(self, image):
+    def prepare_display_image(self, image, base_height=DISPLAY_IMAGE_HEIGHT):
         """Resize the image for display while preserving aspect ratio."""
-        base_height = 480
         aspect_ratio = image.shape[1] / image.shape[0]
         new_width = int(base_height * aspect_ratio)
         display_image = cv2.resize(image, (new_width, base_height), interpolation=cv2.INTER_LINEAR)
@@ -1600,7 +1723,7 @@ class TextureTagger:
 
 
     def add_all_to_queue(self):
-        self.download_manager.add_all_to_queue()
+        self.download_manager.add_all_to_queue(self.filtered_texture_paths)
 
     def show_queue(self):
         self.download_manager.show_queue()
@@ -1654,10 +1777,9 @@ class TextureTagger:
                 ]
         else:
             if self.active_buttons:
-                self.filtered_texture_paths = [
-                    path for path in self.texture_paths
-                    if any(os.path.basename(path).casefold().startswith(tag.casefold()) for tag in self.active_buttons)
-                ]
+                self.filtered_texture_paths = self.texture_path_index.filter(
+                    tag.casefold() for tag in self.active_buttons
+                )
             else:
                 self.filtered_texture_paths = self.texture_paths
         
@@ -1699,10 +1821,11 @@ class TextureTagger:
         self.current_index = 0
         self.display_texture()
 
-    def get_matching_textures(self):
-        """Retrieve textures from the Polyhaven API that match the tags of the current texture."""
+    def get_matching_textures(self, texture_path=None):
+        """Retrieve textures from the Polyhaven API that match the tags of the current (or given) texture."""
         # Get the current texture path
-        texture_path = self.filtered_texture_paths[self.current_index]
+        if texture_path is None:
+            texture_path = self.filtered_texture_paths[self.current_index]
         texture_path = texture_path.lower()
 
         # Retrieve tags for the current texture
@@ -1717,12 +1840,6 @@ class TextureTagger:
             return []  # No textures fetched, return empty
 
         # Filter assets by matching tags and store each texture as an object
-        matching_textures = [
-            texture  # The whole texture object will be stored, including the 'id' field
-            for texture in all_textures.values()
-            if any(tag in texture.get("tags", []) for tag in current_tags)
-        ]
-
-        return matching_textures   
+        return matching_assets(all_textures, current_tags)   
 
     
\ No newline at end of file
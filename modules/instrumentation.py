@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import threading
+import functools
+
+from collections import deque
+
+from modules.constants import TRACE_BUFFER_SIZE
+
+
+class Histogram:
+    """Duration histogram with power-of-two microsecond buckets, plus count, total and max."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, duration_ns):
+        bucket = (duration_ns // 1000).bit_length()  # bucket b holds durations below 2**b us
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+
+    def percentile(self, fraction):
+        """Upper bound (in ms) of the bucket holding the given fraction of samples."""
+        target = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return (2 ** bucket) / 1000
+        return self.max_ns / 1e6
+
+
+class Tracer:
+    """Low-overhead span recorder.
+
+    Spans are timed with perf_counter_ns and kept in a ring buffer of the last
+    TRACE_BUFFER_SIZE events, and every span name feeds a histogram. Nothing is
+    printed while recording; use summary() or export_chrome_trace() afterwards.
+    When disabled, span() returns a shared no-op context manager.
+    """
+
+    def __init__(self, capacity=TRACE_BUFFER_SIZE):
+        self.enabled = False
+        self.events = deque(maxlen=capacity)
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def record(self, name, category, start_ns, end_ns, args=None):
+        """Store a finished span; also usable for work timed across threads or processes."""
+        duration_ns = end_ns - start_ns
+        with self.lock:
+            self.events.append((name, category, start_ns, duration_ns, threading.get_ident(), args))
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(duration_ns)
+
+    def span(self, name, category="app", **args):
+        """Context manager timing the enclosed block."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, category, args or None)
+
+    def traced(self, name=None, category="app"):
+        """Decorator timing every call of a function as a span."""
+        def decorator(function):
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start_ns = time.perf_counter_ns()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(span_name, category, start_ns, time.perf_counter_ns())
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """Return one line per span name: count, mean, p50, p95 and max in milliseconds."""
+        with self.lock:
+            histograms = sorted(self.histograms.items(), key=lambda item: item[1].total_ns, reverse=True)
+            lines = [
+                f"{name:<40} n={histogram.count:<6} mean={histogram.total_ns / histogram.count / 1e6:8.2f}ms "
+                f"p50<={histogram.percentile(0.5):8.2f}ms p95<={histogram.percentile(0.95):8.2f}ms "
+                f"max={histogram.max_ns / 1e6:8.2f}ms"
+                for name, histogram in histograms
+            ]
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path):
+        """Write the buffered spans as Chrome trace JSON (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        with self.lock:
+            events = list(self.events)
+        trace_events = []
+        for name, category, start_ns, duration_ns, thread_id, args in events:
+            event = {"name": name, "cat": category, "ph": "X", "ts": start_ns / 1000, "dur": duration_ns / 1000,
+                     "pid": pid, "tid": thread_id}
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            trace_events.append(event)
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+        os.replace(temp_path, path)
+
+
+class Span:
+    __slots__ = ("tracer", "name", "category", "args", "start_ns")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.record(self.name, self.category, self.start_ns, time.perf_counter_ns(), self.args)
+        return False
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
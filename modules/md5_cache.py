@@ -0,0 +1,88 @@
+import os
+import json
+import hashlib
+import threading
+
+from modules.constants import MD5_CACHE_FILE
+
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
+def hash_file(file_path, hash_md5=None):
+    """Feed a file through an MD5 object using a reusable 1 MiB buffer and return the object."""
+    hash_md5 = hash_md5 or hashlib.md5()
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, "rb") as file:
+        while True:
+            read = file.readinto(buffer)
+            if not read:
+                break
+            hash_md5.update(view[:read])
+    return hash_md5
+
+
+class Md5Cache:
+    """Persistent MD5 digests of staged files keyed by (path, size, mtime).
+
+    A file whose size and mtime are unchanged since it was last hashed, or
+    since its digest was recorded while downloading, is verified with a
+    single stat instead of a full read.
+    """
+
+    def __init__(self, cache_file=MD5_CACHE_FILE):
+        self.cache_file = cache_file
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load MD5 cache: {e}")
+
+    def save(self):
+        """Write the cache to disk if anything changed since the last save."""
+        with self.lock:
+            if not self.dirty:
+                return
+            temp_path = f"{self.cache_file}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(temp_path, self.cache_file)
+            self.dirty = False
+
+    def record(self, file_path, md5_hash):
+        """Store a digest computed elsewhere (e.g. while the file was streamed to disk)."""
+        stat = os.stat(file_path)
+        with self.lock:
+            self.entries[os.path.normpath(file_path)] = {"md5": md5_hash, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+            self.dirty = True
+
+    def digest(self, file_path):
+        """Return the MD5 of file_path, hashing it only if it changed since it was last seen."""
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+
+        key = os.path.normpath(file_path)
+        entry = self.entries.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return entry["md5"]
+
+        md5_hash = hash_file(file_path).hexdigest()
+        with self.lock:
+            self.entries[key] = {"md5": md5_hash, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+            self.dirty = True
+        return md5_hash
+
+    def forget(self, file_path):
+        with self.lock:
+            if self.entries.pop(os.path.normpath(file_path), None) is not None:
+                self.dirty = True
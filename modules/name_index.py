@@ -0,0 +1,59 @@
+import bisect
+
+# Sorts after every other code point, so prefix + this bounds the prefix range
+_PREFIX_END = "\U0010ffff"
+
+
+class PrefixIndex:
+    """Sorted index over a list of values supporting prefix queries in O(log n + k)."""
+
+    def __init__(self, values=(), key=None):
+        """
+        Args:
+            values: Values to index, in their original order.
+            key: Optional function mapping a value to the string that is matched
+                 against prefixes (e.g. basename, casefolded basename).
+        """
+        self.values = list(values)
+        self.key = key or (lambda value: value)
+
+        entries = sorted((self.key(value), position) for position, value in enumerate(self.values))
+        self._keys = [entry[0] for entry in entries]
+        self._positions = [entry[1] for entry in entries]
+
+    def __len__(self):
+        return len(self.values)
+
+    def _bounds(self, prefix):
+        """Return the slice of the sorted keys that start with prefix."""
+        low = bisect.bisect_left(self._keys, prefix)
+        high = bisect.bisect_right(self._keys, prefix + _PREFIX_END, lo=low)
+        return low, high
+
+    def positions(self, prefix):
+        """Return the original positions of all values whose key starts with prefix, in key order."""
+        low, high = self._bounds(prefix)
+        return self._positions[low:high]
+
+    def matches(self, prefix):
+        """Return all values whose key starts with prefix, sorted by key."""
+        return [self.values[position] for position in self.positions(prefix)]
+
+    def count(self, prefix):
+        """Return the number of values whose key starts with prefix."""
+        low, high = self._bounds(prefix)
+        return high - low
+
+    def first(self, prefix):
+        """Return the earliest value (in original order) whose key starts with prefix, or None."""
+        positions = self.positions(prefix)
+        if not positions:
+            return None
+        return self.values[min(positions)]
+
+    def filter(self, prefixes):
+        """Return the values matching any of the prefixes, preserving original order."""
+        positions = set()
+        for prefix in prefixes:
+            positions.update(self.positions(prefix))
+        return [self.values[position] for position in sorted(positions)]
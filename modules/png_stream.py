@@ -0,0 +1,100 @@
+import os
+import zlib
+import struct
+import numpy as np
+
+from modules.constants import PNG_COMPRESSION_LEVEL
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color type per channel count: gray, gray+alpha, RGB, RGBA
+COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+# PNG "Up" row filter: each byte minus the byte above it
+FILTER_UP = 2
+
+
+class PngStreamWriter:
+    """Write an 8-bit PNG incrementally, a strip of rows at a time.
+
+    Only the current strip and the last row written are held in memory, so an
+    image of any size can be produced from row strips without ever existing
+    as one array. Rows are Up-filtered and deflated with zlib (which releases
+    the GIL), into a temp file that is renamed into place on close.
+
+    Strips are (rows, width, channels) uint8 arrays in OpenCV's BGR(A) channel
+    order unless bgr=False.
+    """
+
+    def __init__(self, path, width, height, channels, bgr=True, level=PNG_COMPRESSION_LEVEL):
+        if channels not in COLOR_TYPES:
+            raise ValueError(f"Unsupported channel count: {channels}")
+        self.path = path
+        self.temp_path = f"{path}.tmp"
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.bgr = bgr and channels >= 3
+        self.rows_written = 0
+        self.previous_row = np.zeros(width * channels, dtype=np.uint8)
+        self.compressor = zlib.compressobj(level)
+
+        self.file = open(self.temp_path, "wb")
+        self.file.write(PNG_SIGNATURE)
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, COLOR_TYPES[channels], 0, 0, 0))
+
+    def _write_chunk(self, tag, data):
+        self.file.write(struct.pack(">I", len(data)))
+        self.file.write(tag)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag))))
+
+    def write_rows(self, rows):
+        """Append a strip of rows to the image."""
+        rows = np.asarray(rows, dtype=np.uint8)
+        if self.bgr:
+            rows = rows[..., [2, 1, 0, 3][:self.channels]]
+        rows = rows.reshape(len(rows), self.width * self.channels)
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError(f"Too many rows for a {self.width}x{self.height} PNG")
+
+        filtered = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = FILTER_UP
+        np.subtract(rows[0], self.previous_row, out=filtered[0, 1:])
+        np.subtract(rows[1:], rows[:-1], out=filtered[1:, 1:])
+        self.previous_row = rows[-1].copy()
+        self.rows_written += len(rows)
+
+        data = self.compressor.compress(filtered)
+        if data:
+            self._write_chunk(b"IDAT", data)
+
+    def close(self):
+        """Finish the image and move it into place."""
+        if self.file.closed:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(f"Wrote {self.rows_written} of {self.height} rows to {self.path}")
+            self._write_chunk(b"IDAT", self.compressor.flush())
+            self._write_chunk(b"IEND", b"")
+        except Exception:
+            self.abort()
+            raise
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        """Discard a partially written image."""
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
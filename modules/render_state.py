@@ -0,0 +1,37 @@
+from collections import namedtuple
+
+# Immutable snapshot of everything a preview frame depends on besides the textures.
+# The UI publishes a new one per frame; the renderer never sees a half-updated set.
+RenderState = namedtuple('RenderState', ['mix_ratio', 'rot', 'hue', 'sat', 'val', 'hsvToggle'])
+
+# RenderState field -> shader uniform name
+STATE_UNIFORMS = {
+    'mix_ratio': 'mixRatio',
+    'rot': 'rot',
+    'hue': 'hue',
+    'sat': 'sat',
+    'val': 'val',
+    'hsvToggle': 'hsvToggle',
+}
+
+MAX_TEXTURE_SIZE = 2048
+
+
+def prepare_texture_image(image, max_size=MAX_TEXTURE_SIZE):
+    """Convert an image to RGB and shrink it to fit max_size, as every renderer backend uploads it."""
+    # Convert to RGB if needed
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    # Resize for performance if needed
+    if image.width > max_size or image.height > max_size:
+        # Calculate new size preserving aspect ratio
+        aspect = image.width / image.height
+        if image.width > image.height:
+            new_width = max_size
+            new_height = int(max_size / aspect)
+        else:
+            new_height = max_size
+            new_width = int(max_size * aspect)
+        image = image.resize((new_width, new_height))
+    return image
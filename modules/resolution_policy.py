@@ -0,0 +1,75 @@
+import re
+from PIL import Image
+
+from modules.constants import DOWNLOAD_RESOLUTION_SCALE, DOWNLOAD_MAX_RESOLUTION, DOWNLOAD_FORMATS
+
+# Polyhaven map files are named {slug}_{map}_{resolution}k.{format}
+MAP_FILE_PATTERN = re.compile(r"_(diffuse|diff|color|nor_dx|arm|disp|height)_(\d+)k\.(\w+)$", re.IGNORECASE)
+
+MAP_ROLES = {
+    "diffuse": "diff",
+    "diff": "diff",
+    "color": "diff",
+    "nor_dx": "nor",
+    "arm": "arm",
+    "disp": "disp",
+    "height": "disp",
+}
+
+
+def parse_map_url(url):
+    """Return (role, resolution in pixels, format) for a Polyhaven map URL, or None."""
+    match = MAP_FILE_PATTERN.search(url)
+    if not match:
+        return None
+    map_name, resolution_k, file_format = match.groups()
+    return MAP_ROLES[map_name.lower()], int(resolution_k) * 1024, file_format.lower()
+
+
+def needed_resolution(texture_path, scale=DOWNLOAD_RESOLUTION_SCALE):
+    """Return the source resolution needed for a target texture, or None if its size is unknown."""
+    try:
+        with Image.open(texture_path) as image:
+            return max(image.size) * scale
+    except OSError:
+        return None
+
+
+def select_files(files, needed_size=None, max_resolution=DOWNLOAD_MAX_RESOLUTION, formats=DOWNLOAD_FORMATS):
+    """
+    Pick one file per map role from the extracted file list.
+
+    Per role this is the smallest resolution that is at least needed_size (or the
+    largest available if none is, or if needed_size is unknown), capped at
+    max_resolution, and at that resolution the smallest allowed format.
+
+    Args:
+        files: [{"url", "md5", "size"}] as returned by extract_files_with_md5.
+        needed_size: Required size in pixels of the longest edge, or None.
+
+    Returns:
+        dict: {role: file_info}
+    """
+    candidates = {}
+    for file_info in files:
+        parsed = parse_map_url(file_info["url"])
+        if parsed is None:
+            continue
+        role, resolution, file_format = parsed
+        if resolution > max_resolution or file_format not in formats.get(role, []):
+            continue
+        candidates.setdefault(role, []).append((resolution, file_format, file_info))
+
+    selected = {}
+    for role, role_candidates in candidates.items():
+        resolutions = sorted({resolution for resolution, _, _ in role_candidates})
+        large_enough = [resolution for resolution in resolutions if needed_size and resolution >= needed_size]
+        resolution = large_enough[0] if large_enough else resolutions[-1]
+
+        # Smallest file wins; fall back to the configured format order when sizes are missing
+        format_order = formats[role]
+        selected[role] = min(
+            (candidate for candidate in role_candidates if candidate[0] == resolution),
+            key=lambda candidate: (candidate[2].get("size") or float("inf"), format_order.index(candidate[1])),
+        )[2]
+    return selected
@@ -0,0 +1,95 @@
+import os
+import threading
+
+# Filename markers identifying each map role, in lookup order
+MAP_ROLES = {
+    "arm": ["_arm_"],
+    "nor": ["_nor_"],
+    "disp": ["_disp_", "_height_"],
+    "diff": ["_diffuse_", "_diff_", "_color_"],
+}
+
+# Transfers still in progress or interrupted, never usable as sources
+PARTIAL_SUFFIXES = (".part", ".tmp")
+
+
+class StagingIndex:
+    """Index of downloaded source maps: asset slug -> map role -> path.
+
+    Every staged file of a role is remembered too (an asset can be staged at
+    several resolutions or formats); find_all() returns them. The staging folder is scanned once, on first lookup; after that, files are
+    added as downloads complete, so resolving an asset's maps is a dict lookup.
+    """
+
+    def __init__(self, staging_dir="staging"):
+        self.staging_dir = staging_dir
+        self.assets = {}
+        self.all_files = {}
+        self.built = False
+        self.lock = threading.Lock()
+
+    def classify(self, filename):
+        """Return (slug, role) for a staged map filename, or None if it is not a source map."""
+        filename_casefold = filename.casefold()
+        if filename_casefold.endswith(PARTIAL_SUFFIXES):
+            return None
+        for role, markers in MAP_ROLES.items():
+            for marker in markers:
+                index = filename_casefold.rfind(marker)
+                if index > 0:
+                    return filename_casefold[:index], role
+        return None
+
+    def add(self, file_path, replace=True):
+        """Index a staged file. Later downloads replace earlier files for the same role."""
+        classified = self.classify(os.path.basename(file_path))
+        if classified is None:
+            return
+        slug, role = classified
+        with self.lock:
+            roles = self.assets.setdefault(slug, {})
+            if replace or role not in roles:
+                roles[role] = file_path
+            role_files = self.all_files.setdefault(slug, {}).setdefault(role, [])
+            if file_path not in role_files:
+                role_files.append(file_path)
+
+    def build(self):
+        """Scan the staging folder into the index."""
+        with self.lock:
+            self.assets = {}
+            self.all_files = {}
+            self.built = True
+        if not os.path.isdir(self.staging_dir):
+            return
+        with os.scandir(self.staging_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    # Keep the first match per role, as a directory scan would
+                    self.add(entry.path, replace=False)
+
+    def files_for(self, slug):
+        """Return {role: path} for an asset slug, rescanning once if the asset is unknown."""
+        slug = slug.casefold().replace(" ", "_")
+        if not self.built:
+            self.build()
+        roles = self.assets.get(slug)
+        if roles is None:
+            # The folder may have changed behind our back (another process, manual copies)
+            self.build()
+            roles = self.assets.get(slug, {})
+        return dict(roles)
+
+    def find(self, slug, role):
+        """Return the staged path for one map role of an asset, or None."""
+        return self.files_for(slug).get(role)
+
+    def find_all(self, slug, role):
+        """Return every staged path that still exists for one map role of an asset."""
+        self.files_for(slug)
+        with self.lock:
+            paths = list(self.all_files.get(slug.casefold().replace(" ", "_"), {}).get(role, []))
+        return [path for path in paths if os.path.exists(path)]
+
+
+staging_index = StagingIndex()
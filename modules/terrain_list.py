@@ -0,0 +1,54 @@
+import os
+import threading
+
+from modules.constants import TERRAIN_FILE
+
+
+def normalize_texture_name(name):
+    """Lowercase a texture name and strip whitespace and extension, as terrain_dump.txt lines are compared."""
+    return os.path.splitext(name.strip().lower())[0]
+
+
+class TerrainList:
+    """The texture names of a terrain list file, loaded once and reloaded when the file changes."""
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, filepath=TERRAIN_FILE):
+        self.filepath = filepath
+        self.mtime = None
+        self.names = []
+        self.name_set = set()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_file(cls, filepath=TERRAIN_FILE):
+        """Return the shared list for filepath."""
+        with cls._instances_lock:
+            if filepath not in cls._instances:
+                cls._instances[filepath] = cls(filepath)
+            return cls._instances[filepath]
+
+    def refresh(self):
+        """Reload the file if its mtime changed. Raises FileNotFoundError if it is missing."""
+        mtime = os.stat(self.filepath).st_mtime_ns
+        if mtime == self.mtime:
+            return
+        with self.lock:
+            with open(self.filepath, "r") as file:
+                names = [normalize_texture_name(line) for line in file]
+            # Keep file order for reports, drop blanks and duplicates
+            self.names = [name for name in dict.fromkeys(names) if name]
+            self.name_set = set(self.names)
+            self.mtime = mtime
+
+    def get_names(self):
+        """Return the normalized names in file order."""
+        self.refresh()
+        return self.names
+
+    def contains(self, name):
+        """Return True if the (extensionless) texture name is in the list, ignoring case."""
+        self.refresh()
+        return name.lower() in self.name_set
@@ -1,9 +1,20 @@
 import os
+import tempfile
 import cv2
 import numpy as np
 from PIL import Image, ImageTk
 
-from modules.constants import OVERLAY_FOLDER
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.constants import OVERLAY_FOLDER, ENCODE_WORKERS, TERRAIN_FILE, CONVERT_TILE_PIXELS, TILED_COMPOSE_PIXELS
+from modules.staging_index import staging_index
+from modules.terrain_list import TerrainList
+from modules.png_stream import PngStreamWriter
+
+def compose_texture(texture_path, thumbnail_name, texture_name_label, staged_files=None):
+    """Process-pool entry point for combine_textures; the combine step needs no db or asset state."""
+    TextureOperations(None, None).combine_textures(texture_path, thumbnail_name, texture_name_label, staged_files)
+
 
 class TextureOperations:
     def __init__(self, db, all_assets):
@@ -22,7 +33,7 @@ class TextureOperations:
 
             # Normalize bit depth if needed (for overlays, e.g., 16-bit images)
             if image.dtype == np.uint16:  # 16-bit or 48-bit image
-                image = (image / 256).astype(np.uint8)
+                image = self.convert_to_8bit_single_channel(image)
 
             # Convert to RGBA
             if image.ndim == 2:  # Grayscale
@@ -96,38 +107,107 @@ class TextureOperations:
 
             return tuple(channels)
 
-    def convert_to_8bit_single_channel(self, texture):
+    def convert_to_8bit_single_channel(self, texture, out=None):
         """
         Converts a texture to 8-bit single-channel format.
-        
+
+        The conversion runs over row strips of CONVERT_TILE_PIXELS so the only
+        full-size allocation is the 8-bit result: 16-bit data is right-shifted,
+        floats are scaled in place in a strip-sized buffer, wide integers are
+        clipped strip by strip.
+
+        Float textures (EXR/HDR) are normalized to their maximum; if they hold
+        negative values (e.g. signed displacement) the range from their minimum
+        to maximum is used instead. NaNs map to 0.
+
         Args:
             texture (numpy.ndarray): Input texture, can be grayscale or RGB, 
                                     with bit depth 8, 16, 32, or 48.
+            out (numpy.ndarray): Optional uint8 array of the texture's shape (e.g. a
+                                 memory map) to convert into instead of a new array.
         Returns:
             numpy.ndarray: 8-bit single-channel texture.
         """
-
-        # Determine the bit depth of the input texture
         if texture.dtype == np.uint8:
             # Already 8-bit, no further conversion needed
-            return texture
-        elif texture.dtype == np.uint16:
-            # Convert 16-bit to 8-bit
-            texture = (texture / 256).astype(np.uint8)
-        elif texture.dtype in [np.float32, np.float64]:
-            # Normalize float textures to 0-255 and convert to 8-bit
-            texture = (255 * (texture / np.max(texture))).astype(np.uint8)
-        elif texture.dtype == np.int32 or texture.dtype == np.int64:
-            # Clip values to 0-255 and convert to 8-bit
-            texture = np.clip(texture, 0, 255).astype(np.uint8)
-        else:
+            if out is None:
+                return texture
+            out[:] = texture
+            return out
+        if texture.dtype not in [np.uint16, np.float32, np.float64, np.int32, np.int64]:
             raise ValueError(f"Unsupported texture dtype: {texture.dtype}")
-        
-        return texture
 
-    def combine_textures(self, texture_path, thumbnail_name, texture_name_label):
+        output = np.empty(texture.shape, dtype=np.uint8) if out is None else out
+        row_pixels = max(1, texture[:1].size)
+        strip_rows = min(texture.shape[0], max(1, CONVERT_TILE_PIXELS // row_pixels))
+
+        if texture.dtype == np.uint16:
+            # x >> 8 equals x / 256 truncated; the ufunc casts into the output buffer directly
+            for start in range(0, texture.shape[0], strip_rows):
+                np.right_shift(texture[start:start + strip_rows], 8, out=output[start:start + strip_rows], casting="unsafe")
+            return output
+
+        if texture.dtype in [np.int32, np.int64]:
+            for start in range(0, texture.shape[0], strip_rows):
+                output[start:start + strip_rows] = np.clip(texture[start:start + strip_rows], 0, 255)
+            return output
+
+        # Floats: find the range once, then scale each strip in a reused buffer
+        low = min(float(np.nanmin(texture)), 0.0)
+        high = float(np.nanmax(texture))
+        if not np.isfinite(high) or high <= low:
+            output.fill(0)
+            return output
+
+        buffer = np.empty((strip_rows,) + texture.shape[1:], dtype=texture.dtype)
+        for start in range(0, texture.shape[0], strip_rows):
+            strip = texture[start:start + strip_rows]
+            scaled = buffer[:len(strip)]
+            np.subtract(strip, low, out=scaled)
+            np.divide(scaled, high - low, out=scaled)
+            np.multiply(scaled, 255, out=scaled)
+            np.nan_to_num(scaled, copy=False, nan=0.0)
+            np.clip(scaled, 0, 255, out=scaled)
+            output[start:start + strip_rows] = scaled
+        return output
+
+    def convert_to_8bit(self, texture, out=None):
+        """
+        Converts a texture of any supported bit depth to 8-bit, keeping all its channels.
+
+        Float textures are normalized per channel, matching convert_to_8bit_single_channel.
+        out is passed through as in convert_to_8bit_single_channel.
+        """
+        if texture.dtype in [np.float32, np.float64] and texture.ndim == 3:
+            if out is None:
+                return np.dstack([self.convert_to_8bit_single_channel(texture[:, :, c]) for c in range(texture.shape[2])])
+            for c in range(texture.shape[2]):
+                self.convert_to_8bit_single_channel(texture[:, :, c], out=out[:, :, c])
+            return out
+        return self.convert_to_8bit_single_channel(texture, out=out)
+
+    def save_texture(self, output_path, texture, description, pool=None):
+        """Encode and write a texture, on the given thread pool if any. Returns the Future or None."""
+        def write():
+            cv2.imwrite(output_path, texture)
+            print(f"Saved {description} texture: {output_path}")
+
+        if pool is None:
+            write()
+            return None
+        return pool.submit(write)
+
+    def combine_textures(self, texture_path, thumbnail_name, texture_name_label, staged_files=None):
         """
         Combines texture components into various output textures.
+
+        Each source map is decoded once, all channel packing is done with whole-array
+        operations, and decodes and encodes run on a thread pool (cv2 releases the GIL).
+        Sources larger than TILED_COMPOSE_PIXELS go through combine_textures_tiled instead.
+
+        Args:
+            staged_files (dict): Optional {role: path} of the source maps ("arm", "nor",
+                                 "disp", "diff"); looked up in the staging index if omitted.
         """
         staging_dir = "staging"
         os.makedirs(staging_dir, exist_ok=True)
@@ -143,81 +223,257 @@ class TextureOperations:
             print(f"File not found: {file_path}")
             return None
 
-        # Helper function to find a file
-        def find_file(substrings, down_thumbnail_name):
-            if isinstance(substrings, str):
-                substrings = [substrings]
-            for filename in os.listdir(staging_dir):
-                filename_casefold = filename.casefold()
-                if filename_casefold.startswith(down_thumbnail_name):
-                    for substring in substrings:
-                        if substring in filename_casefold:
-                            return os.path.join(staging_dir, filename)
+        # Locate texture files
+        if staged_files is None:
+            staged_files = staging_index.files_for(down_thumbnail_name)
+        arm_file = staged_files.get("arm")
+        nor_file = staged_files.get("nor")
+        disp_file = staged_files.get("disp")
+        diff_file = staged_files.get("diff")
+
+        if self.largest_source_pixels(staged_files.values()) > TILED_COMPOSE_PIXELS:
+            self.combine_textures_tiled(texture_name_label, down_thumbnail_name, staging_dir, staged_files)
+            return
+
+        with ThreadPoolExecutor(max_workers=ENCODE_WORKERS) as pool:
+            # Decode all sources concurrently
+            arm_texture, nor_texture, disp_texture, diff_texture = pool.map(
+                load_image, [arm_file, nor_file, disp_file, diff_file]
+            )
+
+            # ARM feeds both param and diffparam, so convert it once
+            if arm_texture is not None:
+                arm_texture = self.convert_to_8bit(arm_texture)
+
+            # Create textures; encodes are queued on the pool and overlap with the next packing step
+            writes = []
+            writes += self.create_param_texture(texture_name_label, staging_dir, arm_texture, pool)
+            writes += self.create_nh_texture(texture_name_label, staging_dir, nor_texture, disp_texture, pool)
+            writes += self.process_and_save_diff_textures(texture_name_label, down_thumbnail_name, staging_dir, diff_texture, arm_texture, pool)
+
+            for write in writes:
+                if write is not None:
+                    write.result()
+
+    def resolve_overlay_target(self, texture_name_label, down_thumbnail_name):
+        """
+        Work out where and at what size the overlay for a texture is written.
+
+        Returns:
+            tuple: (target_size, overlay_output_path, skip_overlay), or None if the
+                   texture's _result.png is missing or unreadable. skip_overlay is set
+                   when an existing overlay is already larger than the target.
+        """
+        # Path to the results file (assumes it's in the current working directory)
+        results_file_path = f"{texture_name_label}_result.png"
+
+        # Retrieve target size from the results file header
+        if not os.path.isfile(results_file_path):
+            print(f"Error: Results file not found: {results_file_path}")
+            return None
+
+        try:
+            with Image.open(results_file_path) as results_image:
+                target_size = results_image.size  # (width, height)
+        except OSError as e:
+            print(f"Error: Failed to load results image: {results_file_path} ({e})")
             return None
 
-        # Load texture files
-        arm_file = find_file("_arm_", down_thumbnail_name)
-        nor_file = find_file("_nor_", down_thumbnail_name)
-        disp_file = find_file(["_disp_", "_height_"], down_thumbnail_name)
-        diff_file = find_file(["_diffuse_", "_diff_", "_color_"], down_thumbnail_name)
+        # Check if existing overlay exists and is larger
+        overlay_output_path = os.path.join(OVERLAY_FOLDER, f"{down_thumbnail_name}_overlay.png")
+        existing_size = None
+        if os.path.isfile(overlay_output_path):
+            try:
+                with Image.open(overlay_output_path) as existing_overlay:
+                    existing_size = existing_overlay.size
+            except OSError:
+                existing_size = None
+
+        skip_overlay = existing_size is not None and (existing_size[1] > target_size[1] or existing_size[0] > target_size[0])
+        return target_size, overlay_output_path, skip_overlay
+
+    def largest_source_pixels(self, file_paths):
+        """Return the pixel count of the largest readable source map, from the file headers only."""
+        largest = 0
+        for file_path in file_paths:
+            try:
+                with Image.open(file_path) as image:
+                    largest = max(largest, image.size[0] * image.size[1])
+            except (OSError, TypeError, ValueError):
+                # EXR and missing files: no header size, decide on the others
+                continue
+        return largest
+
+    def load_plane(self, file_path, scratch_dir, name, channels=None):
+        """
+        Decode one source map, convert it to 8-bit and spill it to a disk-backed array.
+
+        OpenCV can only decode a whole image, so the full-depth decode is the one
+        full-size allocation: it is converted strip by strip straight into a memory
+        map under scratch_dir (no in-memory 8-bit copy) and released before the next
+        source is loaded. The OS can page the 8-bit plane out between strips.
+
+        Args:
+            channels: Optional slice or index applied to the channel axis before conversion.
 
-        arm_texture = load_image(arm_file)
-        nor_texture = load_image(nor_file)
-        disp_texture = load_image(disp_file)
-        diff_texture = load_image(diff_file)
+        Returns:
+            numpy.memmap: The 8-bit plane, or None if the file is missing or unreadable.
+        """
+        if not file_path or not os.path.exists(file_path):
+            print(f"File not found: {file_path}")
+            return None
+        texture = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
+        if texture is None:
+            print(f"Failed to load image: {file_path}")
+            return None
+        if channels is not None and texture.ndim == 3:
+            texture = texture[:, :, channels]
 
-        # Create textures
-        self.create_param_texture(texture_name_label, staging_dir, arm_texture)
-        self.create_nh_texture(texture_name_label, staging_dir, nor_texture, disp_texture)
-        self.process_and_save_diff_textures(texture_name_label, down_thumbnail_name, staging_dir, diff_texture, arm_texture)
+        plane = np.lib.format.open_memmap(os.path.join(scratch_dir, f"{name}.npy"), mode="w+", dtype=np.uint8, shape=texture.shape)
+        self.convert_to_8bit(texture, out=plane)
+        del texture
+        plane.flush()
+        return plane
 
-    def create_param_texture(self, texture_name_label, staging_dir, arm_texture):
-        """Creates and saves the _param texture."""
+    def save_texture_strips(self, output_path, shape, pack_strip, description):
+        """
+        Write a texture of the given (height, width, channels) shape strip by strip.
+
+        pack_strip(start, stop) returns rows start..stop as a BGR(A) uint8 array; no
+        full-size output array is ever built.
+        """
+        height, width, channels = shape
+        strip_rows = max(1, CONVERT_TILE_PIXELS // (width * channels))
+        with PngStreamWriter(output_path, width, height, channels) as writer:
+            for start in range(0, height, strip_rows):
+                writer.write_rows(pack_strip(start, min(height, start + strip_rows)))
+        print(f"Saved {description} texture: {output_path}")
+
+    def combine_textures_tiled(self, texture_name_label, down_thumbnail_name, staging_dir, staged_files):
+        """
+        Lower-memory variant of combine_textures for very large source maps.
+
+        Sources are decoded one at a time and converted into 8-bit disk-backed planes,
+        then every output is packed and PNG-encoded in row strips of about
+        CONVERT_TILE_PIXELS values. Peak memory is the largest full-depth decode (OpenCV
+        cannot decode in strips) plus a few strips, instead of all sources and all
+        outputs at full resolution. Outputs match combine_textures.
+        """
+        with tempfile.TemporaryDirectory(dir=staging_dir, ignore_cleanup_errors=True) as scratch_dir:
+            planes = {
+                "arm": self.load_plane(staged_files.get("arm"), scratch_dir, "arm"),
+                "nor": self.load_plane(staged_files.get("nor"), scratch_dir, "nor", slice(0, 3)),
+                # Displacement: red channel, or the single channel
+                "disp": self.load_plane(staged_files.get("disp"), scratch_dir, "disp", 2),
+                "diff": self.load_plane(staged_files.get("diff"), scratch_dir, "diff", slice(0, 3)),
+            }
+            try:
+                with ThreadPoolExecutor(max_workers=ENCODE_WORKERS) as pool:
+                    writes = self.submit_tiled_outputs(texture_name_label, down_thumbnail_name, staging_dir, planes, pool)
+                    for write in writes:
+                        write.result()
+            finally:
+                # Unmap before the scratch folder is removed (required on Windows)
+                planes.clear()
+
+    def submit_tiled_outputs(self, texture_name_label, down_thumbnail_name, staging_dir, planes, pool):
+        """Queue the strip-encoded outputs of combine_textures_tiled on the pool and return the futures."""
+        arm, nor, disp, diff = planes["arm"], planes["nor"], planes["disp"], planes["diff"]
+        writes = []
+
+        if arm is not None:
+            def pack_param(start, stop):
+                # BGRA: mid-gray (128), green, blue, red of the ARM map
+                strip = np.empty((stop - start,) + arm.shape[1:2] + (4,), dtype=np.uint8)
+                strip[:, :, 0] = 128
+                strip[:, :, 1] = arm[start:stop, :, 1]
+                strip[:, :, 2] = arm[start:stop, :, 0]
+                strip[:, :, 3] = arm[start:stop, :, 2]
+                return strip
+
+            param_output_path = os.path.join(staging_dir, f"{texture_name_label}_param.png")
+            writes.append(pool.submit(self.save_texture_strips, param_output_path, arm.shape[:2] + (4,), pack_param, "param"))
+
+        if nor is not None and disp is not None:
+            def pack_nh(start, stop):
+                # BGRA: normal map BGR plus displacement as alpha
+                strip = np.empty((stop - start,) + nor.shape[1:2] + (4,), dtype=np.uint8)
+                strip[:, :, :3] = nor[start:stop]
+                strip[:, :, 3] = disp[start:stop]
+                return strip
+
+            nh_output_path = os.path.join(staging_dir, f"{texture_name_label}_nh.png")
+            writes.append(pool.submit(self.save_texture_strips, nh_output_path, nor.shape[:2] + (4,), pack_nh, "nh"))
+
+        if diff is None:
+            return writes
+
+        diff_output_path = os.path.join(staging_dir, f"{texture_name_label}.png")
+        writes.append(pool.submit(self.save_texture_strips, diff_output_path, diff.shape, lambda start, stop: diff[start:stop], "diffuse"))
+
+        overlay_target = self.resolve_overlay_target(texture_name_label, down_thumbnail_name)
+        if overlay_target is None:
+            return writes
+
+        target_size, overlay_output_path, skip_overlay = overlay_target
+        if skip_overlay:
+            print(f"Skipping overlay creation: existing overlay is larger than target size")
+        else:
+            # The overlay is small; resizing reads the mapped diffuse plane directly
+            overlay_texture = cv2.resize(diff, target_size, interpolation=cv2.INTER_LINEAR)
+            writes.append(pool.submit(self.save_texture, overlay_output_path, overlay_texture, "overlay"))
+
+        filename = os.path.basename(texture_name_label).replace(".dds", "")
+        filename = filename.replace(".tga", "").lower()
+
+        if arm is not None and self.is_in_txt(filename):
+            def pack_diffparam(start, stop):
+                # Diffuse BGR plus the green channel of the ARM texture as alpha
+                strip = np.empty((stop - start,) + diff.shape[1:2] + (4,), dtype=np.uint8)
+                strip[:, :, :3] = diff[start:stop]
+                strip[:, :, 3] = arm[start:stop, :, 1]
+                return strip
+
+            diffparam_output_path = os.path.join(staging_dir, f"{texture_name_label}_diffparam.png")
+            writes.append(pool.submit(self.save_texture_strips, diffparam_output_path, diff.shape[:2] + (4,), pack_diffparam, "diffparam"))
+
+        return writes
+
+    def create_param_texture(self, texture_name_label, staging_dir, arm_texture, pool=None):
+        """Creates and saves the _param texture. Returns the pending writes (None when written inline)."""
         if arm_texture is None:
-            return
-        param_r = self.convert_to_8bit_single_channel(arm_texture[:, :, 0])  # Blue
-        param_g = self.convert_to_8bit_single_channel(arm_texture[:, :, 1])  # Green
-        param_b = np.full_like(param_g, 128)  # Mid-gray (128)
-        param_a = self.convert_to_8bit_single_channel(arm_texture[:, :, 2])  # Red
+            return []
+        arm_8bit = self.convert_to_8bit(arm_texture)
+
+        # BGRA: mid-gray (128), green, blue, red of the ARM map
+        param_texture = np.empty(arm_8bit.shape[:2] + (4,), dtype=np.uint8)
+        param_texture[:, :, 0] = 128
+        param_texture[:, :, 1] = arm_8bit[:, :, 1]
+        param_texture[:, :, 2] = arm_8bit[:, :, 0]
+        param_texture[:, :, 3] = arm_8bit[:, :, 2]
 
-        # Combine into a single texture
-        param_texture = cv2.merge([param_b, param_g, param_r, param_a])
         param_output_path = os.path.join(staging_dir, f"{texture_name_label}_param.png")
-        cv2.imwrite(param_output_path, param_texture)
-        print(f"Saved param texture: {param_output_path}")
+        return [self.save_texture(param_output_path, param_texture, "param", pool)]
 
-    def create_nh_texture(self, texture_name_label, staging_dir, nor_texture, disp_texture):
-        """Creates and saves the _nh texture."""
+    def create_nh_texture(self, texture_name_label, staging_dir, nor_texture, disp_texture, pool=None):
+        """Creates and saves the _nh texture. Returns the pending writes (None when written inline)."""
         if nor_texture is None or disp_texture is None:
-            return
-        nh_red = self.convert_to_8bit_single_channel(nor_texture[:, :, 2])  # Red
-        nh_green = self.convert_to_8bit_single_channel(nor_texture[:, :, 1])  # Green
-        nh_blue = self.convert_to_8bit_single_channel(nor_texture[:, :, 0])  # Blue
-        nh_alpha = self.convert_to_8bit_single_channel(disp_texture[:, :, 2] if len(disp_texture.shape) == 3 else disp_texture)
+            return []
+
+        # BGRA: normal map BGR plus displacement (red channel, or the single channel) as alpha
+        nh_texture = np.empty(nor_texture.shape[:2] + (4,), dtype=np.uint8)
+        nh_texture[:, :, :3] = self.convert_to_8bit(nor_texture[:, :, :3])
+        nh_texture[:, :, 3] = self.convert_to_8bit_single_channel(disp_texture[:, :, 2] if len(disp_texture.shape) == 3 else disp_texture)
 
-        # Combine into a single texture
-        nh_texture = cv2.merge([nh_blue, nh_green, nh_red, nh_alpha])
         nh_output_path = os.path.join(staging_dir, f"{texture_name_label}_nh.png")
-        cv2.imwrite(nh_output_path, nh_texture)
-        print(f"Saved nh texture: {nh_output_path}")
-
-    def is_in_txt(self, filename, filepath="terrain_dump.txt"):
-        filename = filename.lower()
-        def clean_line(line):
-            cleaned = os.path.splitext(line.strip().lower())[0]
-            #print(f"Checking line: '{line.strip()}' -> Cleaned: '{cleaned}'")  # Debugging output
-            return cleaned
-        
-        with open(filepath, "r") as file:
-            for line in file:
-                if clean_line(line) == filename:
-                    #print(f"Match found: {filename}")  # Debugging output
-                    return True
-        #print(f"No match found for: {filename}")  # Debugging output
-        return False
+        return [self.save_texture(nh_output_path, nh_texture, "nh", pool)]
 
+    def is_in_txt(self, filename, filepath=TERRAIN_FILE):
+        """Check whether a texture name is listed in the terrain list file."""
+        return TerrainList.for_file(filepath).contains(filename)
 
-    def process_and_save_diff_textures(self, texture_name_label, down_thumbnail_name, staging_dir, diff_texture, arm_texture):
+
+    def process_and_save_diff_textures(self, texture_name_label, down_thumbnail_name, staging_dir, diff_texture, arm_texture, pool=None):
         """
         Processes and saves textures: diffuse (converted to 8-bit), diffparam, overlay (resized), and zoom (original size).
         
@@ -226,76 +482,44 @@ class TextureOperations:
             staging_dir (str): Directory to save the textures.
             diff_texture (np.ndarray): The diffuse texture.
             arm_texture (np.ndarray): The ARM texture.
+            pool (ThreadPoolExecutor): Optional pool the encodes are submitted to.
+
+        Returns:
+            list: The pending writes (None entries were written inline).
         """
+        writes = []
         if diff_texture is None:
-            return
-
-
-        # Convert each channel of the diffuse texture to 8-bit
-        d_red = self.convert_to_8bit_single_channel(diff_texture[:, :, 0])  # Red
-        d_green = self.convert_to_8bit_single_channel(diff_texture[:, :, 1])  # Green
-        d_blue = self.convert_to_8bit_single_channel(diff_texture[:, :, 2])  # Blue
-        #print("Converted diffuse texture channels to 8-bit.")
+            return writes
 
-        # Combine the channels into an 8-bit diffuse texture
-        diff_texture_8bit = cv2.merge([d_red, d_green, d_blue])
+        # Convert the diffuse texture to 8-bit in one pass
+        diff_texture_8bit = self.convert_to_8bit(diff_texture[:, :, :3])
 
         # Save the diffuse texture
         diff_output_path = os.path.join(staging_dir, f"{texture_name_label}.png")
-        cv2.imwrite(diff_output_path, diff_texture_8bit)
-        print(f"Saved diffuse texture: {diff_output_path}")
+        writes.append(self.save_texture(diff_output_path, diff_texture_8bit, "diffuse", pool))
 
-        # Path to the results file (assumes it's in the current working directory)
-        results_file_path = f"{texture_name_label}_result.png"
-
-        # Retrieve target size from the results file
-        if not os.path.isfile(results_file_path):
-            print(f"Error: Results file not found: {results_file_path}")
-            return
+        overlay_target = self.resolve_overlay_target(texture_name_label, down_thumbnail_name)
+        if overlay_target is None:
+            return writes
 
-        # Load the results image to get its size
-        results_image = cv2.imread(results_file_path, cv2.IMREAD_UNCHANGED)
-        if results_image is None:
-            print(f"Error: Failed to load results image: {results_file_path}")
-            return
-
-        target_size = (results_image.shape[1], results_image.shape[0])  # (width, height)
-        #print(f"Retrieved target size from results file: {target_size}")
-
-        # Check if existing overlay exists and is larger
-        overlay_output_path = os.path.join(OVERLAY_FOLDER, f"{down_thumbnail_name}_overlay.png")
-        if os.path.isfile(overlay_output_path):
-            existing_overlay = cv2.imread(overlay_output_path, cv2.IMREAD_UNCHANGED)
-            if existing_overlay is not None and (existing_overlay.shape[0] > target_size[1] or existing_overlay.shape[1] > target_size[0]):
-                print(f"Skipping overlay creation: existing overlay is larger than target size")
-            else:
-                # Save the overlay texture (resized)
-                overlay_texture = cv2.resize(diff_texture_8bit, target_size, interpolation=cv2.INTER_LINEAR)
-                print("overlay_output_path", overlay_output_path)
-                cv2.imwrite(overlay_output_path, overlay_texture)
-                print(f"Saved overlay texture: {overlay_output_path}")
+        target_size, overlay_output_path, skip_overlay = overlay_target
+        if skip_overlay:
+            print(f"Skipping overlay creation: existing overlay is larger than target size")
         else:
             # Save the overlay texture (resized)
             overlay_texture = cv2.resize(diff_texture_8bit, target_size, interpolation=cv2.INTER_LINEAR)
-            print("overlay_output_path", overlay_output_path)
-            cv2.imwrite(overlay_output_path, overlay_texture)
-            print(f"Saved overlay texture: {overlay_output_path}")
-
+            writes.append(self.save_texture(overlay_output_path, overlay_texture, "overlay", pool))
 
         filename = os.path.basename(texture_name_label).replace(".dds", "")
         filename = filename.replace(".tga", "").lower()
 
-
-
         # If arm_texture is provided, create and save the diffparam texture
         if arm_texture is not None and self.is_in_txt(filename):
-            # Convert the green channel of ARM texture to 8-bit for alpha
-            d_alpha = self.convert_to_8bit_single_channel(arm_texture[:, :, 1])  # Green (from ARM)
-
-            # Combine diffuse channels with alpha into diffparam texture
-            diffparam_texture = cv2.merge([d_red, d_green, d_blue, d_alpha])
+            diffparam_texture = np.empty(diff_texture_8bit.shape[:2] + (4,), dtype=np.uint8)
+            diffparam_texture[:, :, :3] = diff_texture_8bit
+            # Green channel of the ARM texture as alpha
+            diffparam_texture[:, :, 3] = self.convert_to_8bit_single_channel(arm_texture[:, :, 1])
             diffparam_output_path = os.path.join(staging_dir, f"{texture_name_label}_diffparam.png")
-            
-            #print("DIFF: ", texture_name_label)
-            cv2.imwrite(diffparam_output_path, diffparam_texture)
-            print(f"Saved diffparam texture: {diffparam_output_path}")
+            writes.append(self.save_texture(diffparam_output_path, diffparam_texture, "diffparam", pool))
+
+        return writes
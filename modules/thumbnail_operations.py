@@ -1,9 +1,10 @@
 import os
+import threading
 from PIL import Image
 import requests
 from urllib.parse import urlparse
 
-from modules.constants import THUMBNAIL_CACHE_DIR
+from modules.constants import THUMBNAIL_CACHE_DIR, THUMBNAIL_DISPLAY_DIR, THUMBNAIL_VARIANTS, THUMBNAIL_DISPLAY_SCALE
 
 def ensure_thumbnail_cache_dir():
     if not os.path.exists(THUMBNAIL_CACHE_DIR):
@@ -31,4 +32,56 @@ def fetch_thumbnail(thumbnail_url):
             print(f"Failed to fetch thumbnail. Status code: {response.status_code}")
     except requests.RequestException as e:
         print(f"An error occurred: {e}")
-    return None
\ No newline at end of file
+    return None
+
+def get_variant_path(thumbnail_url, variant):
+    if not os.path.exists(THUMBNAIL_DISPLAY_DIR):
+        os.makedirs(THUMBNAIL_DISPLAY_DIR, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(urlparse(thumbnail_url).path))[0]
+    return os.path.join(THUMBNAIL_DISPLAY_DIR, f"{stem}_{variant}.png")
+
+def scale_for_display(image, fit):
+    """Fit the image into a fit x fit box (if given), then scale it by THUMBNAIL_DISPLAY_SCALE."""
+    if fit:
+        image = image.copy()
+        image.thumbnail((fit, fit))
+    width, height = image.size
+    size = (int(width * THUMBNAIL_DISPLAY_SCALE), int(height * THUMBNAIL_DISPLAY_SCALE))
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+def create_thumbnail_variants(cache_path, thumbnail_url):
+    """Scale a cached thumbnail to every display variant, store them and return them by name."""
+    variants = {}
+    with Image.open(cache_path) as image:
+        image.load()
+        for variant, fit in THUMBNAIL_VARIANTS.items():
+            scaled = scale_for_display(image, fit)
+            variant_path = get_variant_path(thumbnail_url, variant)
+            temp_path = f"{variant_path}.{threading.get_ident()}.tmp"
+            scaled.save(temp_path, format="PNG", compress_level=1)
+            os.replace(temp_path, variant_path)
+            variants[variant] = scaled
+    return variants
+
+def fetch_thumbnail_variant(thumbnail_url, variant, download=True):
+    """
+    Return a thumbnail at the size the GUI shows it, as one small PNG decode.
+
+    The variants are created together the first time any of them is needed;
+    ThumbnailService runs this for many thumbnails in parallel. With
+    download=False a thumbnail that is not cached yet gives None.
+    """
+    variant_path = get_variant_path(thumbnail_url, variant)
+    if os.path.exists(variant_path):
+        try:
+            with Image.open(variant_path) as image:
+                image.load()
+                return image
+        except OSError as e:
+            print(f"Recreating damaged thumbnail {variant_path}: {e}")
+
+    cache_path = get_cached_thumbnail_path(thumbnail_url)
+    if not os.path.exists(cache_path):
+        if not download or fetch_thumbnail(thumbnail_url) is None:
+            return None
+    return create_thumbnail_variants(cache_path, thumbnail_url)[variant]
@@ -0,0 +1,101 @@
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.constants import THUMBNAIL_WORKERS, THUMBNAIL_READY_ENTRIES
+from modules.thumbnail_operations import fetch_thumbnail_variant
+
+
+def prepare_thumbnail(thumbnail_url):
+    """Load a thumbnail at the thumbnail grid's size, fetching and scaling it only the first time."""
+    return fetch_thumbnail_variant(thumbnail_url, "grid")
+
+
+def matching_assets(all_assets, tags):
+    """Return the assets sharing at least one tag with tags, in catalog order."""
+    return [
+        texture  # The whole texture object will be stored, including the 'id' field
+        for texture in all_assets.values()
+        if any(tag in texture.get("tags", []) for tag in tags)
+    ]
+
+
+class ThumbnailService:
+    """Fetches and decodes display-size thumbnails on a worker pool.
+
+    Results are kept as display-ready PIL images in a small LRU and handed to
+    callbacks on the Tk thread via root.after, where the PhotoImage can be
+    created. prefetch() warms the cache for thumbnails likely to be shown next.
+    """
+
+    def __init__(self, root, max_workers=THUMBNAIL_WORKERS, max_entries=THUMBNAIL_READY_ENTRIES):
+        self.root = root
+        self.max_entries = max_entries
+        self.ready = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnail")
+
+    def request(self, thumbnail_url, callback):
+        """
+        Call callback(image) on the Tk thread once the thumbnail is ready.
+
+        Thumbnails that are already prepared are delivered immediately, without a
+        round trip through the event loop. image is None if the fetch failed.
+        """
+        with self.lock:
+            image = self.ready.get(thumbnail_url)
+            if image is not None:
+                self.ready.move_to_end(thumbnail_url)
+        if image is not None:
+            callback(image)
+            return
+        future = self._submit(thumbnail_url)
+        future.add_done_callback(lambda done: self.root.after(0, lambda: callback(self._result(done))))
+
+    def prefetch(self, thumbnail_urls):
+        """Prepare thumbnails in the background without delivering them."""
+        for thumbnail_url in thumbnail_urls:
+            if thumbnail_url:
+                self._submit(thumbnail_url)
+
+    def prefetch_matching(self, all_assets, tags, count):
+        """
+        Prefetch the first count thumbnails matching tags; the catalog scan runs on a worker too.
+
+        all_assets must not be modified afterwards (the GUI swaps in a new catalog
+        rather than updating it), and tags should be a copy.
+        """
+        def scan():
+            self.prefetch(texture.get("thumbnail_url") for texture in matching_assets(all_assets, tags)[:count])
+        self.executor.submit(scan)
+
+    def _submit(self, thumbnail_url):
+        with self.lock:
+            future = self.pending.get(thumbnail_url)
+            if future is None:
+                future = self.executor.submit(self._prepare, thumbnail_url)
+                self.pending[thumbnail_url] = future
+            return future
+
+    def _prepare(self, thumbnail_url):
+        try:
+            image = prepare_thumbnail(thumbnail_url)
+        except Exception as e:
+            print(f"Error loading thumbnail from {thumbnail_url}: {e}")
+            image = None
+
+        with self.lock:
+            self.pending.pop(thumbnail_url, None)
+            if image is not None:
+                self.ready[thumbnail_url] = image
+                while len(self.ready) > self.max_entries:
+                    self.ready.popitem(last=False)
+        return image
+
+    def _result(self, future):
+        return None if future.cancelled() else future.result()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,52 +1,6 @@
 import os
-import time
-import sys
 
 
-# Global dictionary to track start times of functions
-start_times = {}
-
-# Stack to keep track of function call hierarchy
-call_stack = []
-
-# Threshold for long-running functions (in seconds)
-LONG_FUNCTION_THRESHOLD = 0.004
-
-# Boolean flag to toggle the logging behavior
-log_long_functions = True  # Set this to False to log all function calls
-
-def log_function_calls(frame, event, arg):
-    if event == "call":
-        func_name = frame.f_code.co_name
-        func_file = frame.f_code.co_filename
-        func_line = frame.f_lineno
-        print(f"Function {func_name} called in {func_file}:{func_line}")
-
-def profile_function(frame, event, arg):
-    if event == "call":
-        start_times[frame.f_code] = time.perf_counter()
-        call_stack.append((frame.f_code, frame.f_lineno))
-    elif event == "return":
-        end_time = time.perf_counter()
-        start_time = start_times.get(frame.f_code)
-        if start_time:
-            execution_time = end_time - start_time
-            if execution_time > LONG_FUNCTION_THRESHOLD:
-                indentation = '  ' * (len(call_stack) - 1)
-                function_name = frame.f_code.co_name
-                function_line = frame.f_lineno
-                function_file = frame.f_code.co_filename
-                print(f"{indentation}Function '{function_name}' (Line {function_line}, File: {function_file}) "
-                      f"took {execution_time:.4f} seconds")
-            call_stack.pop()
-
-def set_profiler():
-    if log_long_functions:
-        sys.setprofile(profile_function)
-    else:
-        sys.setprofile(log_function_calls)
-        
-
 def translate_texture_path(file_path):
     base_filename = os.path.basename(file_path)
     name_without_ext = os.path.splitext(base_filename)[0]